@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class DeleteResult:
+    """
+    Outcome of `Dir.remove_tree`.
+
+    :param path: The deleted path.
+    :param files: Number of removed files and symlinks.
+    :param dirs: Number of removed directories.
+    :param failed: (path, error message) pairs of entries that could not be removed.
+    :param duration: Wall-clock duration of the deletion in seconds.
+    :param pending: (Optional) For background deletions, a Future resolving to the `DeleteResult`
+    of deleting the renamed tree.
+    """
+    path: str
+    files: int = 0
+    dirs: int = 0
+    failed: list = field(default_factory=list)
+    duration: float = 0.0
+    pending: Optional[Future] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def merge(self, other: "DeleteResult") -> None:
+        self.files += other.files
+        self.dirs += other.dirs
+        self.failed.extend(other.failed)
+
+    def wait(self) -> "DeleteResult":
+        """
+        :return: This result, or the result of the background deletion once it has finished.
+        """
+        return self.pending.result() if self.pending else self
@@ -1,11 +1,53 @@
 # -*- coding: utf-8 -*-
-from shutil import rmtree, copytree
-from os import makedirs, scandir, walk, chmod
-from os.path import isdir, join
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from shutil import rmtree, copytree, copystat, Error
+from os import (
+    makedirs, scandir, chmod, remove, replace, rename, getpid, symlink, readlink, unlink, rmdir,
+    open as os_open, close as os_close, supports_dir_fd, supports_fd, DirEntry, O_RDONLY
+)
+from os.path import isdir, islink, isjunction, lexists, join, relpath, dirname, basename
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Iterator, Optional
+from uuid import uuid4
 from rich import print
 
+from host_tools.utils.DeleteResult import DeleteResult
+from host_tools.utils.SyncResult import SyncResult
 
-def copy(path_from: str, path_to: str, stdout: bool = True, stderr: bool = True, overwrite: bool = False) -> None:
+try:
+    from os import O_DIRECTORY, O_NOFOLLOW
+except ImportError:
+    O_DIRECTORY = O_NOFOLLOW = 0
+
+_FD_BASED = {unlink, rmdir, os_open} <= supports_dir_fd and scandir in supports_fd
+_background_lock = Lock()
+_background_executor: Optional[ThreadPoolExecutor] = None
+
+
+def copy(
+        path_from: str,
+        path_to: str,
+        stdout: bool = True,
+        stderr: bool = True,
+        overwrite: bool = False,
+        workers: int = None,
+        process_bar: bool = False
+) -> None:
+    """
+    Copy a directory tree.
+
+    :param path_from: The directory to copy.
+    :param path_to: The destination. If it exists and `overwrite` is False, a numbered suffix is added.
+    :param stdout: (Optional) Print the result. Defaults to True.
+    :param stderr: (Optional) Print warnings. Defaults to True.
+    :param overwrite: (Optional) Copy into an existing destination, replacing existing files. Defaults to False.
+    :param workers: (Optional) Copy files on a pool of this many threads, after creating the directory skeleton.
+    Files are copied with reflinks, `os.copy_file_range` or `os.sendfile` where the platform supports them.
+    Defaults to None: a sequential `shutil.copytree`.
+    :param process_bar: (Optional) Show the progress of copied bytes when `workers` is set. Defaults to False.
+    """
     if not isdir(path_from):
         return print(f"[bold red]|COPY WARNING| Path from not is folder: {path_from}")
 
@@ -17,12 +59,208 @@ def copy(path_from: str, path_to: str, stdout: bool = True, stderr: bool = True,
             _path_to = path_to + f"({num})"
             num += 1
 
-    copytree(path_from, _path_to, dirs_exist_ok=overwrite)
+    summary = ''
+    if workers:
+        started = perf_counter()
+        count, size = _copy_parallel(path_from, _path_to, workers, process_bar)
+        elapsed = perf_counter() - started
+        summary = f", {count} files, {size} bytes in {elapsed:.2f}s ({size / max(elapsed, 1e-9) / 1024 ** 2:.1f} MiB/s)"
+    else:
+        copytree(path_from, _path_to, dirs_exist_ok=overwrite)
 
     if isdir(path_to):
-        return print(f'[green]|INFO| Copied to: {path_to}') if stdout else None
+        return print(f'[green]|INFO| Copied to: {path_to}{summary}') if stdout else None
     return print(f'[bold red]|COPY WARNING| Dir not copied: {path_to}') if stderr else None
 
+def _copy_parallel(path_from: str, path_to: str, workers: int, process_bar: bool = False) -> tuple[int, int]:
+    """
+    Create the directory skeleton of `path_from` under `path_to`, then copy the files on a thread pool.
+    Symlinked directories are copied with `shutil.copytree`, following them like it does.
+    Errors are collected and raised together as `shutil.Error` after all other files are copied,
+    any other exception of a copy is raised as is.
+
+    :return: The number of copied files and bytes.
+    """
+    from host_tools.utils.File import File  # File imports this module
+
+    dirs, files, linked_dirs, errors = [(path_from, path_to)], [], [], []
+    makedirs(path_to, exist_ok=True)
+
+    for root, subdirs, entries in scan(path_from):
+        target_root = join(path_to, relpath(root, path_from))
+        for entry in subdirs:
+            if entry.is_symlink():
+                linked_dirs.append((entry.path, join(target_root, entry.name)))
+            else:
+                makedirs(join(target_root, entry.name), exist_ok=True)
+                dirs.append((entry.path, join(target_root, entry.name)))
+        for entry in entries:
+            try:
+                files.append((entry.path, join(target_root, entry.name), entry.stat().st_size))
+            except OSError as e:
+                errors.append((entry.path, join(target_root, entry.name), str(e)))
+
+    with File._download_progress(process_bar) as progress:
+        task = progress.add_task('[cyan]Copying', total=sum(size for _, _, size in files))
+
+        def copy_file(src: str, dst: str) -> None:
+            try:
+                File._copy_data(src, dst, on_copy=lambda copied: progress.advance(task, copied))
+                copystat(src, dst)
+            except OSError as e:
+                errors.append((src, dst, str(e)))
+
+        def copy_linked_dir(src: str, dst: str) -> None:
+            try:
+                copytree(src, dst, dirs_exist_ok=True)
+            except (OSError, Error) as e:
+                errors.append((src, dst, str(e)))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(copy_file, src, dst) for src, dst, _ in files]
+            futures += [executor.submit(copy_linked_dir, src, dst) for src, dst in linked_dirs]
+            for future in futures:
+                future.result()
+
+    for src, dst in reversed(dirs):
+        copystat(src, dst)
+
+    if errors:
+        raise Error(errors)
+
+    return len(files), sum(size for _, _, size in files)
+
+def sync(
+        path_from: str,
+        path_to: str,
+        checksum: bool = False,
+        delete: bool = False,
+        dry_run: bool = False,
+        exceptions_dirs: list = None,
+        workers: int = None,
+        process_bar: bool = False,
+        stdout: bool = True
+) -> SyncResult:
+    """
+    Make `path_to` a copy of `path_from` by copying only new and changed files, like rsync.
+    Files are considered changed if their size or mtime differ, copied files keep the mtime of the source
+    so the next sync skips them. Symlinks are recreated as symlinks.
+
+    :param path_from: The source directory.
+    :param path_to: The destination directory, created if it does not exist.
+    :param checksum: (Optional) Compare files of equal size by their SHA-256 digest instead of their mtime.
+    :param delete: (Optional) Delete files and directories in `path_to` that do not exist in `path_from`.
+    :param dry_run: (Optional) Only report what would be done. Defaults to False.
+    :param exceptions_dirs: (Optional) Directory paths relative to both trees to leave alone.
+    :param workers: (Optional) Number of threads copying and hashing files. Defaults to None.
+    :param process_bar: (Optional) Show the progress of copied bytes. Defaults to False.
+    :param stdout: (Optional) Print a summary. Defaults to True.
+    :return: A `SyncResult` with the copied, updated and deleted paths.
+    """
+    from host_tools.utils.DirSnapshot import DirSnapshot
+    from host_tools.utils.File import File  # File imports this module
+
+    started, result = perf_counter(), SyncResult()
+    source = DirSnapshot.take(path_from, exceptions_dirs=exceptions_dirs)
+    target = DirSnapshot.take(path_to, exceptions_dirs=exceptions_dirs) if isdir(path_to) else DirSnapshot(path_to)
+
+    candidates = []
+    for rel_path, state in source.files.items():
+        current = target.files.get(rel_path)
+        if current is None:
+            result.copied.append(rel_path)
+        elif current.size != state.size:
+            result.updated.append(rel_path)
+        elif checksum or current.mtime_ns != state.mtime_ns:
+            candidates.append(rel_path)
+        else:
+            result.unchanged += 1
+
+    if checksum and candidates:
+        for rel_path in [rel_path for rel_path in candidates if islink(join(path_from, rel_path))]:
+            candidates.remove(rel_path)
+            src, dst = join(path_from, rel_path), join(path_to, rel_path)
+            if islink(dst) and readlink(src) == readlink(dst):
+                result.unchanged += 1
+            else:
+                result.updated.append(rel_path)
+
+        digests = File._hash_files(
+            [join(path_from, rel_path) for rel_path in candidates] + [join(path_to, rel_path) for rel_path in candidates],
+            'sha256',
+            workers
+        )
+        for rel_path in candidates:
+            if digests[join(path_from, rel_path)] != digests[join(path_to, rel_path)]:
+                result.updated.append(rel_path)
+                continue
+
+            result.unchanged += 1
+            if not dry_run and source.files[rel_path].mtime_ns != target.files[rel_path].mtime_ns:
+                copystat(join(path_from, rel_path), join(path_to, rel_path))
+    else:
+        result.updated.extend(candidates)
+
+    result.copied.sort()
+    result.updated.sort()
+    transfers = result.copied + result.updated
+    result.size = sum(source.files[rel_path].size for rel_path in transfers)
+
+    if delete:
+        result.deleted = sorted(target.files.keys() - source.files.keys())
+        result.deleted += sorted(
+            (rel_dir for rel_dir in target.dirs.keys() - source.dirs.keys()),
+            key=lambda rel_dir: rel_dir.count('/'),
+            reverse=True
+        )
+
+    if not dry_run:
+        for rel_path in result.deleted:
+            try:
+                rmtree(join(path_to, rel_path)) if rel_path in target.dirs else remove(join(path_to, rel_path))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                result.errors.append((rel_path, str(e)))
+
+        for rel_dir in sorted(source.dirs, key=lambda _dir: _dir.count('/')):
+            remove(join(path_to, rel_dir)) if rel_dir in target.files else None
+            makedirs(join(path_to, rel_dir), exist_ok=True)
+
+        with File._download_progress(process_bar) as progress:
+            task = progress.add_task('[cyan]Syncing', total=result.size)
+
+            def transfer(rel_path: str) -> None:
+                src, dst = join(path_from, rel_path), join(path_to, rel_path)
+                tmp_path = f"{dst}.{getpid()}.sync"
+                try:
+                    if islink(src):
+                        symlink(readlink(src), tmp_path)
+                        copystat(src, tmp_path, follow_symlinks=False)
+                    else:
+                        File._copy_data(src, tmp_path, on_copy=lambda copied: progress.advance(task, copied))
+                        copystat(src, tmp_path)
+                    replace(tmp_path, dst)
+                except OSError as e:
+                    remove(tmp_path) if lexists(tmp_path) else None
+                    result.errors.append((rel_path, str(e)))
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(transfer, transfers))
+
+        for rel_dir in sorted(source.dirs, key=lambda _dir: _dir.count('/'), reverse=True):
+            copystat(join(path_from, rel_dir), join(path_to, rel_dir))
+
+    result.duration = perf_counter() - started
+    if stdout:
+        print(
+            f"[green]|INFO| {'Would sync' if dry_run else 'Synced'} {path_from} to {path_to}: "
+            f"{len(result.copied)} new, {len(result.updated)} updated, {len(result.deleted)} deleted, "
+            f"{result.unchanged} unchanged, {result.size} bytes in {result.duration:.2f}s"
+        )
+
+    return result
+
 def create(dir_path: "str | tuple | list", stdout: bool = True, stderr: bool = True) -> None:
     for _dir_path in [dir_path] if isinstance(dir_path, str) else dir_path:
         if not isdir(_dir_path):
@@ -36,21 +274,100 @@ def create(dir_path: "str | tuple | list", stdout: bool = True, stderr: bool = T
 
         print(f'[green]|INFO| Folder exists: {_dir_path}') if stdout else ...
 
-def get_paths(path: str, end_dir: str = None, dir_include: str = None) -> list:
+def get_paths(
+        path: str,
+        end_dir: str = None,
+        dir_include: str = None,
+        workers: int = None,
+        sort: bool = False
+) -> list:
+    """
+    Retrieve directory paths under a given directory.
+
+    :param path: The directory path to search in.
+    :param end_dir: (Optional) Only include directories whose name ends with this string (case-insensitive).
+    :param dir_include: (Optional) Only include directories containing this substring in their name.
+    :param workers: (Optional) Number of threads scanning directories in parallel, see `scan`. Defaults to None.
+    :param sort: (Optional) Return the paths sorted, parallel scans otherwise return them in completion order.
+    :return: A list of directory paths.
+    """
     dir_paths = []
 
-    for root, dirs, files in walk(path):
-        for dir_name in dirs:
+    for root, dirs, files in scan(path, workers=workers):
+        for entry in dirs:
             if end_dir:
-                if dir_name.lower().endswith(end_dir if isinstance(end_dir, tuple) else end_dir.lower()):
-                    dir_paths.append(join(root, dir_name))
+                if entry.name.lower().endswith(end_dir if isinstance(end_dir, tuple) else end_dir.lower()):
+                    dir_paths.append(entry.path)
             elif dir_include:
-                if dir_include in dir_name:
-                    dir_paths.append(join(root, dir_name))
+                if dir_include in entry.name:
+                    dir_paths.append(entry.path)
             else:
-                dir_paths.append(join(root, dir_name))
+                dir_paths.append(entry.path)
+
+    return sorted(dir_paths) if sort else dir_paths
+
+def scan(
+        path: str,
+        workers: int = None,
+        skip_dir: Callable[[DirEntry], bool] = None
+) -> Iterator[tuple[str, list[DirEntry], list[DirEntry]]]:
+    """
+    Walk a directory tree with `os.scandir`, yielding (root, dirs, files) with `os.DirEntry` lists like `os.walk`.
+    Symlinked directories are listed but not descended into, unreadable directories are skipped.
+
+    :param path: The directory to walk.
+    :param workers: (Optional) Number of threads scanning directories concurrently, which hides the per-directory
+    latency of network filesystems. At most `workers * 2` directories are scanned at a time and results are
+    yielded in completion order. Defaults to None: a sequential walk in `os.walk` top-down order.
+    :param skip_dir: (Optional) Predicate called with the `DirEntry` of every subdirectory,
+    directories for which it returns True are not descended into.
+    """
+    if workers and workers > 1:
+        yield from _scan_parallel(path, workers, skip_dir)
+        return
+
+    stack = [path]
+    while stack:
+        root, dirs, files = _scan_dir(stack.pop())
+        yield root, dirs, files
+        stack.extend(reversed(_descend(dirs, skip_dir)))
 
-    return dir_paths
+def _scan_parallel(
+        path: str,
+        workers: int,
+        skip_dir: Callable[[DirEntry], bool] = None
+) -> Iterator[tuple[str, list[DirEntry], list[DirEntry]]]:
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        queue, pending = deque([path]), set()
+
+        while queue or pending:
+            while queue and len(pending) < workers * 2:
+                pending.add(executor.submit(_scan_dir, queue.popleft()))
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                root, dirs, files = future.result()
+                queue.extend(_descend(dirs, skip_dir))
+                yield root, dirs, files
+
+def _scan_dir(root: str) -> tuple[str, list[DirEntry], list[DirEntry]]:
+    dirs, files = [], []
+
+    try:
+        with scandir(root) as iterator:
+            for entry in iterator:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(entry)
+    except OSError:
+        pass
+
+    return root, dirs, files
+
+def _descend(dirs: list[DirEntry], skip_dir: Callable[[DirEntry], bool] = None) -> list[str]:
+    return [entry.path for entry in dirs if not entry.is_symlink() and not (skip_dir and skip_dir(entry))]
 
 
 def delete(
@@ -58,8 +375,10 @@ def delete(
         clear_dir: bool = False,
         stdout: bool = True,
         stderr: bool = True,
-        full_access: bool = False
-) -> None:
+        full_access: bool = False,
+        workers: int = None,
+        background: bool = False
+) -> list[DeleteResult]:
     """
     Delete files or directories specified by the path(s). Optionally clear directory contents and change permissions before deletion.
 
@@ -67,16 +386,20 @@ def delete(
     :param clear_dir: If True, re-create directories after deletion to ensure they are empty. Defaults to False.
     :param stdout: If True, print information messages to standard output. Defaults to True.
     :param stderr: If True, print warning messages to standard error. Defaults to True.
-    :param full_access: If True, sets full access permissions (0o777) before deletion. Defaults to False.
-    on 0o777(full access). Defaults to False.
+    :param full_access: If True, sets full access permissions (0o777) on every directory before deleting its content.
+    Defaults to False.
+    :param workers: (Optional) Number of threads deleting subdirectories in parallel, see `remove_tree`.
+    :param background: (Optional) Rename directories aside and delete them in the background, see `remove_tree`.
+    :return: A `DeleteResult` for every deleted directory.
     """
+    results = []
     for _path in [path] if isinstance(path, str) else path:
         if not isdir(_path):
             print(f"[bold red]|DELETE WARNING| Directory not exist: {_path}") if stderr else ...
             continue
 
-        chmod(path, 0o777) if full_access else None
-        rmtree(_path, ignore_errors=True)
+        result = remove_tree(_path, workers=workers, background=background, full_access=full_access)
+        results.append(result)
 
         if clear_dir:
             create(_path, stdout=False)
@@ -84,4 +407,196 @@ def delete(
                 print(f"[bold red]|DELETE WARNING| Not all files are removed from directory: {path}")
                 continue
 
+        if stderr and not result.ok:
+            print(f"[bold red]|DELETE WARNING| {len(result.failed)} entries are not deleted in: {_path}")
+            continue
+
         print(f'[green]|INFO| Deleted: {_path}') if stdout and not isdir(_path) else ...
+
+    return results
+
+def remove_tree(
+        path: str,
+        workers: int = None,
+        background: bool = False,
+        full_access: bool = False
+) -> DeleteResult:
+    """
+    Delete a directory tree. Directories are walked through file descriptors with `os.scandir`
+    and entries are removed relative to them (`unlinkat`), which saves a path lookup per entry
+    and never follows symlinks. Platforms without `dir_fd` support use the same walk with full paths.
+
+    :param path: The directory to delete. Like `shutil.rmtree`, a symlink or junction is refused and left in place.
+    :param workers: (Optional) Number of threads deleting subdirectories in parallel. Defaults to None: sequential.
+    :param background: (Optional) Rename the directory to a hidden sibling and delete it on a background thread,
+    so the call returns immediately. The interpreter waits for pending deletions at exit. Defaults to False.
+    :param full_access: (Optional) Set 0o777 permissions on every directory before deleting its content.
+    :return: A `DeleteResult`, for background deletions its `pending` Future resolves to the final result.
+    """
+    started = perf_counter()
+
+    if islink(path) or isjunction(path):
+        return DeleteResult(path, failed=[(path, 'Cannot call remove_tree on a symbolic link')])
+
+    if background:
+        _path = path.rstrip('/\\')
+        trash_path = join(dirname(_path), f".{basename(_path)}.{uuid4().hex}.trash")
+        rename(path, trash_path)
+
+        global _background_executor
+        with _background_lock:
+            if _background_executor is None:
+                _background_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='remove_tree')
+
+        return DeleteResult(
+            path,
+            duration=perf_counter() - started,
+            pending=_background_executor.submit(remove_tree, trash_path, workers, False, full_access)
+        )
+
+    result = DeleteResult(path)
+
+    if workers and workers > 1:
+        frontier, expanded = [path], []
+        while frontier and len(frontier) < workers * 4:
+            subdirs = []
+            for dir_path in frontier:
+                subdirs.extend(_remove_files(dir_path, result, full_access))
+                expanded.append(dir_path)
+            frontier = subdirs
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(lambda dir_path: _remove_tree(dir_path, full_access), frontier):
+                result.merge(partial)
+
+        for dir_path in reversed(expanded):
+            _remove_dir(dir_path, None, result)
+    else:
+        result.merge(_remove_tree(path, full_access))
+
+    result.duration = perf_counter() - started
+    return result
+
+def _remove_tree(path: str, full_access: bool = False) -> DeleteResult:
+    result = DeleteResult(path)
+
+    if not _FD_BASED:
+        _clear_dir(path, None, result, full_access)
+        _remove_dir(path, None, result)
+        return result
+
+    try:
+        chmod(path, 0o777) if full_access else None
+        dir_fd = os_open(path, O_RDONLY | O_DIRECTORY | O_NOFOLLOW)
+    except OSError as e:
+        result.failed.append((path, str(e)))
+        return result
+
+    try:
+        _clear_dir(path, dir_fd, result, full_access)
+    finally:
+        os_close(dir_fd)
+
+    _remove_dir(path, None, result)
+    return result
+
+def _clear_dir(path: str, dir_fd: Optional[int], result: DeleteResult, full_access: bool = False) -> None:
+    """
+    Remove the content of the directory `path`, which is open as `dir_fd` when the platform supports it.
+    """
+    try:
+        with scandir(path if dir_fd is None else dir_fd) as iterator:
+            entries = list(iterator)
+    except OSError as e:
+        return result.failed.append((path, str(e)))
+
+    for entry in entries:
+        name = entry.path if dir_fd is None else entry.name
+        entry_path = join(path, entry.name)
+
+        try:
+            # like shutil.rmtree, junctions are unlinked like symlinks instead of being emptied
+            is_dir = entry.is_dir(follow_symlinks=False) and not entry.is_junction()
+        except OSError:
+            is_dir = False
+
+        if not is_dir:
+            try:
+                _unlink(name, dir_fd, full_access)
+                result.files += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                result.failed.append((entry_path, str(e)))
+            continue
+
+        if dir_fd is None:
+            chmod(name, 0o777) if full_access else None
+            _clear_dir(entry_path, None, result, full_access)
+        else:
+            try:
+                chmod(name, 0o777, dir_fd=dir_fd) if full_access else None
+                sub_fd = os_open(name, O_RDONLY | O_DIRECTORY | O_NOFOLLOW, dir_fd=dir_fd)
+            except OSError as e:
+                result.failed.append((entry_path, str(e)))
+                continue
+
+            try:
+                _clear_dir(entry_path, sub_fd, result, full_access)
+            finally:
+                os_close(sub_fd)
+
+        _remove_dir(name, dir_fd, result, entry_path)
+
+def _remove_files(path: str, result: DeleteResult, full_access: bool = False) -> list[str]:
+    """
+    Remove the files directly inside `path`, opened without following symlinks where the platform supports it.
+
+    :return: Paths of its subdirectories.
+    """
+    subdirs, dir_fd = [], None
+    try:
+        chmod(path, 0o777) if full_access else None
+        dir_fd = os_open(path, O_RDONLY | O_DIRECTORY | O_NOFOLLOW) if _FD_BASED else None
+        with scandir(path if dir_fd is None else dir_fd) as iterator:
+            entries = list(iterator)
+    except OSError as e:
+        os_close(dir_fd) if dir_fd is not None else None
+        result.failed.append((path, str(e)))
+        return subdirs
+
+    try:
+        for entry in entries:
+            entry_path = join(path, entry.name)
+            try:
+                if entry.is_dir(follow_symlinks=False) and not entry.is_junction():
+                    subdirs.append(entry_path)
+                    continue
+                _unlink(entry_path if dir_fd is None else entry.name, dir_fd, full_access)
+                result.files += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                result.failed.append((entry_path, str(e)))
+    finally:
+        os_close(dir_fd) if dir_fd is not None else None
+
+    return subdirs
+
+def _unlink(name: str, dir_fd: Optional[int], full_access: bool = False) -> None:
+    try:
+        unlink(name, dir_fd=dir_fd)
+    except PermissionError:
+        if not full_access:
+            raise
+        chmod(name, 0o777, dir_fd=dir_fd)
+        unlink(name, dir_fd=dir_fd)
+
+def _remove_dir(name: str, dir_fd: Optional[int], result: DeleteResult, path: str = None) -> None:
+    try:
+        rmdir(name, dir_fd=dir_fd)
+        result.dirs += 1
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        result.failed.append((path or name, str(e)))
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+import gzip
+import hashlib
+import json
+
+from dataclasses import dataclass, field
+from os import replace, stat, getpid, readlink, fsencode
+from os.path import join, dirname, abspath, relpath, islink
+from typing import Optional
+
+from host_tools.utils import Dir
+from host_tools.utils.File import File
+from host_tools.utils.HashCache import HashCache
+
+
+@dataclass
+class FileState:
+    """
+    Recorded state of a single file.
+
+    :param size: Size in bytes.
+    :param mtime_ns: Modification time in nanoseconds.
+    :param inode: Inode number, changes when the file is replaced.
+    :param digest: (Optional) Hex digest of the content.
+    """
+    size: int
+    mtime_ns: int
+    inode: int
+    digest: Optional[str] = None
+
+
+@dataclass
+class SnapshotDiff:
+    """
+    Changes between two snapshots, as sorted paths relative to the snapshot root.
+    """
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    modified: list = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+class DirSnapshot:
+    """
+    Index of the files of a directory tree: size, mtime_ns, inode and optionally a digest per file,
+    plus the mtime of every directory. Snapshots are stored as gzip-compressed JSON.
+
+    Comparing a saved snapshot with `DirSnapshot.take(root, previous=snapshot)` answers "what changed"
+    and lets incremental operations touch only the added and modified files.
+    """
+
+    def __init__(
+            self,
+            root: str,
+            files: dict = None,
+            dirs: dict = None,
+            algorithm: str = None,
+            exceptions_dirs: list = None
+    ):
+        """
+        :param root: The snapshotted directory.
+        :param files: `FileState` by path relative to `root`, with '/' separators.
+        :param dirs: Directory mtime_ns by path relative to `root`, '' being the root itself.
+        :param algorithm: hashlib algorithm of the recorded digests, None if no digests are recorded.
+        :param exceptions_dirs: Directory paths relative to `root` left out of the snapshot.
+        """
+        self.root = root
+        self.files: dict[str, FileState] = files or {}
+        self.dirs: dict[str, int] = dirs or {}
+        self.algorithm = algorithm
+        self.exceptions_dirs = exceptions_dirs or []
+
+    @classmethod
+    def take(
+            cls,
+            root: str,
+            algorithm: str = None,
+            previous: "DirSnapshot" = None,
+            quick: bool = False,
+            exceptions_dirs: list = None,
+            workers: int = None,
+            cache: HashCache = None
+    ) -> "DirSnapshot":
+        """
+        Record the current state of a directory tree. Symlinks are recorded as themselves, with their own
+        mtime and inode and a digest of their target path, and symlinked directories are not descended into.
+
+        :param root: The directory to snapshot.
+        :param algorithm: (Optional) hashlib algorithm to record file digests with. Defaults to None.
+        :param previous: (Optional) An earlier snapshot of the same tree. Digests of files whose size, mtime
+        and inode are unchanged are reused instead of re-hashing the files.
+        :param quick: (Optional) Reuse the recorded files of every directory whose mtime is unchanged in `previous`
+        without listing or stat-ing them, only subdirectories are still checked. Adding, removing or renaming a file
+        updates the mtime of its directory, but writing into an existing file in place does not,
+        so such modifications are missed in this mode. Defaults to False.
+        :param exceptions_dirs: (Optional) Directory paths relative to `root` to leave out of the snapshot.
+        :param workers: (Optional) Number of threads hashing files. Defaults to None.
+        :param cache: (Optional) A `HashCache` answering unchanged files without reading them. Defaults to None.
+        :return: The new snapshot.
+        """
+        files, dirs = {}, {}
+        excluded = {_dir.replace('\\', '/').strip('/') for _dir in exceptions_dirs or []}
+        reuse = previous if previous and previous.algorithm == algorithm else None
+        previous_dirs = previous.tree() if quick and previous else {}
+
+        def rel(path: str) -> str:
+            rel_path = relpath(path, root).replace('\\', '/')
+            return '' if rel_path == '.' else rel_path
+
+        def skip_dir(entry) -> bool:
+            rel_path = rel(entry.path)
+            if rel_path in excluded:
+                return True
+            if rel_path in previous_dirs:
+                stack.append(rel_path)  # checked on its own, its files are reused if its mtime is unchanged
+                return True
+            return False
+
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            dir_path = join(root, rel_dir) if rel_dir else root
+            try:
+                mtime_ns = stat(dir_path).st_mtime_ns
+            except OSError:
+                continue
+
+            if rel_dir in previous_dirs and previous.dirs.get(rel_dir) == mtime_ns:
+                dirs[rel_dir] = mtime_ns
+                subdirs, names = previous_dirs[rel_dir]
+                for name in names:
+                    state = previous.files[name]
+                    files[name] = FileState(state.size, state.mtime_ns, state.inode)
+                stack.extend(subdir for subdir in subdirs if subdir not in excluded)
+                continue
+
+            for _root, subdirs, entries in Dir.scan(dir_path, skip_dir=skip_dir):
+                try:
+                    dirs[rel(_root)] = mtime_ns if _root == dir_path else stat(_root).st_mtime_ns
+                except OSError:
+                    continue
+
+                for entry in entries + [entry for entry in subdirs if entry.is_symlink()]:
+                    try:
+                        _stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    files[rel(entry.path)] = FileState(_stat.st_size, _stat.st_mtime_ns, _stat.st_ino)
+
+        if algorithm:
+            to_hash = []
+            for rel_path, state in files.items():
+                old = reuse.files.get(rel_path) if reuse else None
+                if old and old.digest and (old.size, old.mtime_ns, old.inode) == (
+                        state.size, state.mtime_ns, state.inode
+                ):
+                    state.digest = old.digest
+                else:
+                    to_hash.append(rel_path)
+
+            paths = [join(root, rel_path) for rel_path in to_hash]
+            links = {path for path in paths if islink(path)}
+            digests = File._hash_files([path for path in paths if path not in links], algorithm, workers, cache=cache)
+            digests.update({path: hashlib.new(algorithm, fsencode(readlink(path))).hexdigest() for path in links})
+            for rel_path in to_hash:
+                files[rel_path].digest = digests[join(root, rel_path)]
+
+        return cls(root, files, dirs, algorithm, sorted(excluded))
+
+    def diff(self, other: "DirSnapshot") -> SnapshotDiff:
+        """
+        Compare this snapshot with a newer one. A file is modified if its size, mtime or inode changed,
+        or, when both snapshots record digests, if its digest changed.
+
+        :param other: The newer snapshot.
+        :return: Paths added, removed and modified in `other`.
+        """
+        compare_digests = self.algorithm and self.algorithm == other.algorithm
+        result = SnapshotDiff(
+            added=sorted(other.files.keys() - self.files.keys()),
+            removed=sorted(self.files.keys() - other.files.keys())
+        )
+
+        for rel_path in sorted(self.files.keys() & other.files.keys()):
+            old, new = self.files[rel_path], other.files[rel_path]
+            if compare_digests:
+                if old.digest != new.digest:
+                    result.modified.append(rel_path)
+            elif (old.size, old.mtime_ns, old.inode) != (new.size, new.mtime_ns, new.inode):
+                result.modified.append(rel_path)
+
+        return result
+
+    def changes(self, quick: bool = False, workers: int = None, cache: HashCache = None) -> SnapshotDiff:
+        """
+        Compare this snapshot with the live tree, see `take` for the parameters.
+        """
+        return self.diff(
+            DirSnapshot.take(
+                self.root,
+                self.algorithm,
+                previous=self,
+                quick=quick,
+                exceptions_dirs=self.exceptions_dirs,
+                workers=workers,
+                cache=cache
+            )
+        )
+
+    def tree(self) -> dict[str, tuple[list, list]]:
+        """
+        :return: (subdirectories, files) relative paths by relative directory path.
+        """
+        tree = {rel_dir: ([], []) for rel_dir in self.dirs}
+        for rel_dir in self.dirs:
+            if rel_dir:
+                tree[dirname(rel_dir)][0].append(rel_dir)
+        for rel_path in self.files:
+            tree[dirname(rel_path)][1].append(rel_path)
+        return tree
+
+    def save(self, path: str) -> None:
+        """
+        Write the snapshot to `path` atomically.
+        """
+        data = {
+            'root': abspath(self.root),
+            'algorithm': self.algorithm,
+            'exceptions_dirs': self.exceptions_dirs,
+            'dirs': self.dirs,
+            'files': {
+                rel_path: [state.size, state.mtime_ns, state.inode, state.digest]
+                for rel_path, state in self.files.items()
+            }
+        }
+
+        tmp_path = f"{path}.{getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as file:
+            json.dump(data, file, separators=(',', ':'))
+        replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "DirSnapshot":
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            data = json.load(file)
+
+        return cls(
+            data['root'],
+            files={rel_path: FileState(*state) for rel_path, state in data['files'].items()},
+            dirs=data['dirs'],
+            algorithm=data['algorithm'],
+            exceptions_dirs=data.get('exceptions_dirs')
+        )
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+import json
+import hashlib
+
+from itertools import count
+from os import makedirs, remove, replace, getpid
+from os.path import join, isfile, getsize
+from threading import RLock
+from time import time
+from typing import Optional
+
+
+class DownloadCache:
+    """
+    Content-addressed on-disk cache for `File.download`.
+
+    Files are stored once per SHA-256 digest in `<cache_dir>/blobs`, `<cache_dir>/index.json` maps URLs to
+    their digest and `ETag`/`Last-Modified` validators. When the total size of the blobs exceeds `max_size`
+    the least recently used ones are evicted.
+
+    The index is rewritten atomically. Concurrent processes sharing a cache may lose each other's index
+    updates, which only costs a cache miss since blobs are addressed by their content.
+    """
+    INDEX_NAME = 'index.json'
+
+    def __init__(self, cache_dir: str, max_size: int = 10 * 1024 ** 3, link: str = 'auto'):
+        """
+        :param cache_dir: Directory of the cache.
+        :param max_size: (Optional) Maximum total size of cached files in bytes. Defaults to 10 GiB.
+        :param link: (Optional) How cached files are placed into the download folder:
+        'reflink', 'hardlink', 'copy' or 'auto' to try a reflink and fall back to a copy. 'hardlink' avoids
+        the copy on filesystems without reflinks, but the downloaded files then share their content with the cache
+        and must not be modified in place, or later cache hits serve the modified data. Defaults to 'auto'.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.link = link
+        self.blobs_dir = join(cache_dir, 'blobs')
+        self.tmp_dir = join(cache_dir, 'tmp')
+        self.index_path = join(cache_dir, self.INDEX_NAME)
+        self._lock = RLock()
+        self._tmp_ids = count()
+
+        makedirs(self.blobs_dir, exist_ok=True)
+        makedirs(self.tmp_dir, exist_ok=True)
+
+    def blob_path(self, sha256: str) -> str:
+        return join(self.blobs_dir, sha256.lower())
+
+    @property
+    def lock(self) -> RLock:
+        """
+        Lock held while the index is changed and blobs are evicted. Holding it keeps a blob in the cache
+        while it is used, against other threads of this process only.
+        """
+        return self._lock
+
+    def tmp_path(self, url: str) -> str:
+        """
+        Download location for `url` inside the cache, unique per call so concurrent downloads of the same URL
+        by several threads or processes never write into the same file.
+        """
+        with self._lock:
+            tmp_id = next(self._tmp_ids)
+        return join(self.tmp_dir, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.{getpid()}.{tmp_id}")
+
+    def get(self, url: str) -> Optional[dict]:
+        """
+        :return: The index entry of `url` with 'sha256', 'etag', 'last_modified' and 'size' keys,
+        or None if the URL is not cached.
+        """
+        entry = self._read()['urls'].get(url)
+        return entry if entry and isfile(self.blob_path(entry['sha256'])) else None
+
+    def has(self, sha256: str) -> bool:
+        return isfile(self.blob_path(sha256))
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        """
+        :return: `If-None-Match`/`If-Modified-Since` request headers built from an index entry.
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, file_path: str, sha256: str, etag: str = None, last_modified: str = None) -> str:
+        """
+        Move a downloaded file into the cache and record it for `url`.
+
+        :param url: The URL the file was downloaded from.
+        :param file_path: Path to the downloaded file, it is moved into the cache.
+        :param sha256: SHA-256 digest of the file.
+        :param etag: (Optional) `ETag` header of the response.
+        :param last_modified: (Optional) `Last-Modified` header of the response.
+        :return: Path to the cached blob.
+        """
+        sha256 = sha256.lower()
+        blob_path = self.blob_path(sha256)
+
+        with self._lock:
+            if isfile(blob_path):
+                remove(file_path)
+            else:
+                replace(file_path, blob_path)
+
+            index = self._read()
+            index['urls'][url] = {
+                'sha256': sha256,
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': getsize(blob_path)
+            }
+            index['blobs'][sha256] = {'size': getsize(blob_path), 'accessed': time()}
+            self._evict(index, keep=sha256)
+            self._write(index)
+
+        return blob_path
+
+    def touch(self, sha256: str) -> None:
+        """
+        Mark a cached blob as recently used and evict older blobs if the cache is over `max_size`.
+        """
+        with self._lock:
+            index = self._read()
+            sha256 = sha256.lower()
+            index['blobs'][sha256] = {'size': getsize(self.blob_path(sha256)), 'accessed': time()}
+            self._evict(index, keep=sha256)
+            self._write(index)
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used blobs until the cache fits into `max_size`.
+        """
+        with self._lock:
+            index = self._read()
+            self._evict(index)
+            self._write(index)
+
+    def clear(self) -> None:
+        with self._lock:
+            index = self._read()
+            for sha256 in list(index['blobs']):
+                self._remove_blob(index, sha256)
+            self._write(index)
+
+    @property
+    def size(self) -> int:
+        return sum(blob['size'] for blob in self._read()['blobs'].values())
+
+    def _evict(self, index: dict, keep: str = None) -> None:
+        for sha256 in [sha for sha in index['blobs'] if not isfile(self.blob_path(sha))]:
+            self._remove_blob(index, sha256)
+
+        total = sum(blob['size'] for blob in index['blobs'].values())
+        for sha256, blob in sorted(index['blobs'].items(), key=lambda item: item[1]['accessed']):
+            if total <= self.max_size:
+                break
+            if sha256 != keep:
+                total -= blob['size']
+                self._remove_blob(index, sha256)
+
+    def _remove_blob(self, index: dict, sha256: str) -> None:
+        if isfile(self.blob_path(sha256)):
+            remove(self.blob_path(sha256))
+
+        index['blobs'].pop(sha256, None)
+        for url in [url for url, entry in index['urls'].items() if entry['sha256'] == sha256]:
+            del index['urls'][url]
+
+    def _read(self) -> dict:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            index = {}
+
+        index.setdefault('urls', {})
+        index.setdefault('blobs', {})
+        return index
+
+    def _write(self, index: dict) -> None:
+        tmp_path = f"{self.index_path}.{getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(index, file)
+        replace(tmp_path, self.index_path)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import json
+
+from os import remove, replace
+from os.path import exists
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+
+class DownloadJournal:
+    """
+    Sidecar journal of the completed byte ranges of a partially downloaded file.
+    Ranges are stored as inclusive [start, end] pairs, the same way HTTP Range headers express them.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            url: str,
+            size: int,
+            etag: str = None,
+            last_modified: str = None,
+            save_interval: float = 0.5
+    ):
+        """
+        :param path: Path to the journal file.
+        :param url: The URL being downloaded.
+        :param size: Full size of the remote file in bytes.
+        :param etag: (Optional) `ETag` header of the remote file.
+        :param last_modified: (Optional) `Last-Modified` header of the remote file.
+        :param save_interval: (Optional) Minimum number of seconds between journal writes. Defaults to 0.5.
+        """
+        self.path = path
+        self.url = url
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.ranges: list[list[int]] = []
+        self.save_interval = save_interval
+        self._lock = Lock()
+        self._saved_at = 0.0
+
+    @classmethod
+    def load(cls, path: str, url: str, size: int, etag: str = None, last_modified: str = None) -> "DownloadJournal":
+        """
+        Load an existing journal if it still describes the same remote file, otherwise return an empty one.
+        A journal is only trusted when the remote file has a strong `ETag` or a `Last-Modified` validator that matches.
+        """
+        journal = cls(path, url, size, etag=etag, last_modified=last_modified)
+
+        if not exists(path) or not journal.validator:
+            return journal
+
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return journal
+
+        if (data.get('url'), data.get('size'), data.get('etag'), data.get('last_modified')) == (
+                url, size, etag, last_modified
+        ):
+            journal.ranges = [[int(start), int(end)] for start, end in data.get('ranges', [])]
+
+        return journal
+
+    @property
+    def validator(self) -> Optional[str]:
+        """
+        Value for the `If-Range` header so the server refuses partial content if the file has changed.
+        """
+        return self.if_range(self.etag, self.last_modified)
+
+    @staticmethod
+    def if_range(etag: Optional[str], last_modified: Optional[str]) -> Optional[str]:
+        """
+        :return: A strong `ETag`, else `Last-Modified`. Servers must ignore the Range of a request whose
+        `If-Range` is a weak `W/` ETag, so these are never sent.
+        """
+        return etag if etag and not etag.startswith('W/') else last_modified
+
+    @property
+    def completed(self) -> int:
+        return sum(end - start + 1 for start, end in self.ranges)
+
+    def add(self, offset: int, length: int) -> None:
+        """
+        Mark `length` bytes starting at `offset` as written and periodically flush the journal to disk.
+        """
+        with self._lock:
+            merged = []
+            for start, end in sorted(self.ranges + [[offset, offset + length - 1]]):
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self.ranges = merged
+
+            if monotonic() - self._saved_at >= self.save_interval:
+                self._write()
+
+    def missing(self) -> list[tuple[int, int]]:
+        """
+        :return: Inclusive byte ranges that are not downloaded yet.
+        """
+        gaps, position = [], 0
+        for start, end in self.ranges:
+            if start > position:
+                gaps.append((position, start - 1))
+            position = max(position, end + 1)
+
+        if position < self.size:
+            gaps.append((position, self.size - 1))
+
+        return gaps
+
+    def save(self) -> None:
+        with self._lock:
+            self._write()
+
+    def delete(self) -> None:
+        if exists(self.path):
+            remove(self.path)
+
+    def _write(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'url': self.url,
+                    'size': self.size,
+                    'etag': self.etag,
+                    'last_modified': self.last_modified,
+                    'ranges': self.ranges
+                },
+                file
+            )
+        replace(tmp_path, self.path)
+        self._saved_at = monotonic()
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class DownloadResult:
+    """
+    Outcome of a single `File.download` job.
+
+    :param url: The downloaded URL.
+    :param path: Destination path of the file.
+    :param status: 'downloaded', 'cached' when served from a `DownloadCache`, or 'failed'.
+    :param size: Number of bytes on disk after the download.
+    :param duration: Wall-clock duration of the job in seconds.
+    :param error: (Optional) Error message for failed jobs.
+    :param digests: Hex digests computed while downloading, by hashlib algorithm name.
+    """
+    url: str
+    path: str
+    status: str
+    size: int = 0
+    duration: float = 0.0
+    error: Optional[str] = None
+    digests: dict = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.status != 'failed'
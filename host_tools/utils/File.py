@@ -1,57 +1,457 @@
 # -*- coding: utf-8 -*-
 import json
 import hashlib
+import heapq
+import struct
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from codecs import open as codecs_open
-from io import open as io_open
-from typing import Optional
+from io import open as io_open, BufferedReader
+from fnmatch import fnmatchcase
+from threading import local as threading_local
+from contextlib import nullcontext, contextmanager
+from secrets import token_hex
+from typing import Optional, Callable, BinaryIO, Iterator
 
 from requests.structures import CaseInsensitiveDict
 
 from host_tools.utils import Dir, Shell, Str
-from random import randint
-from shutil import move, copyfile
-from os import remove, walk, listdir, scandir, chmod
-from os.path import exists, isfile, isdir, join, getctime, basename, getsize, relpath, dirname
-from tempfile import gettempdir
+from host_tools.utils.DownloadCache import DownloadCache
+from host_tools.utils.DownloadJournal import DownloadJournal
+from host_tools.utils.DownloadResult import DownloadResult
+from host_tools.utils.HashCache import HashCache
+from host_tools.utils.HttpRangeReader import HttpRangeReader
+from shutil import move, copymode, SameFileError
+from errno import ENXIO
+from os import (
+    remove, replace, link, stat, fstat, lseek, ftruncate, getpid, fdopen, makedirs, listdir, scandir, chmod, DirEntry
+)
+from os.path import exists, lexists, samefile, realpath, isfile, isdir, join, basename, getsize, relpath, dirname
+from tempfile import gettempdir, mkdtemp, mkstemp, SpooledTemporaryFile
+from time import perf_counter, mktime
 from platform import system
-from requests import get, head
-from zipfile import ZipFile
+from requests import get, head, Session, Response
+from requests.adapters import HTTPAdapter
+from tarfile import open as tarfile_open
+from zipfile import ZipFile, ZipInfo, ZIP_LZMA, is_zipfile
+from zlib import crc32
 from py7zr import SevenZipFile
 from rich import print
-from rich.progress import track
+try:
+    from fcntl import ioctl
+except ImportError:
+    ioctl = None
+try:
+    from os import copy_file_range
+except ImportError:
+    copy_file_range = None
+try:
+    from os import sendfile
+except ImportError:
+    sendfile = None
+try:
+    from os import SEEK_DATA, SEEK_HOLE, pread, pwrite
+except ImportError:
+    SEEK_DATA = SEEK_HOLE = pread = pwrite = None
+try:
+    from zipfile import _get_compressor
+except ImportError:
+    _get_compressor = None
+from rich.progress import (
+    track,
+    Progress,
+    TaskID,
+    TextColumn,
+    BarColumn,
+    DownloadColumn,
+    TransferSpeedColumn,
+    TimeRemainingColumn
+)
+
+
+class _ProgressReader:
+    """
+    Read-only file object over a streamed response body that reports consumed bytes to a progress task.
+    The progress counts bytes received, which differ from the decoded data with a `Content-Encoding`.
+    """
+
+    def __init__(self, response: Response, progress: Progress, task: TaskID):
+        self._raw = response.raw
+        self._progress = progress
+        self._task = task
+
+    def read(self, size: int = -1) -> bytes:
+        received = self._raw.tell()
+        data = self._raw.read(None if size is None or size < 0 else size, decode_content=True)
+        self._progress.advance(self._task, self._raw.tell() - received)
+        return data
+
+
+class _RangeRefused(ConnectionError):
+    """
+    The server answered a Range request with the whole file, e.g. because it changed since the `If-Range` validator.
+    """
 
 
 class File:
     EXCEPTIONS = ['.DS_Store']
+    FICLONE = 0x40049409
 
     @staticmethod
-    def get_sha256(file_path: str, block_size=65536) -> str:
+    def get_sha256(file_path: str, block_size: int = 1024 * 1024, cache: HashCache = None) -> str:
         """
         Calculate the SHA-256 hash of a file.
 
         :param file_path: The path to the file for which to calculate the SHA-256 hash.
-        :param block_size: (Optional) The block size (in bytes) for reading the file. Defaults to 65536.
+        :param block_size: (Optional) The block size (in bytes) for reading the file. Defaults to 1 MiB.
+        :param cache: (Optional) A `HashCache` answering unchanged files without reading them. Defaults to None.
         :return: The SHA-256 hash of the file as a hexadecimal string.
         """
-        sha256 = hashlib.sha256()
+        return File.get_hash(file_path, 'sha256', block_size, cache)
 
-        with open(file_path, 'rb') as file:
-            for block in iter(lambda: file.read(block_size), b''):
-                sha256.update(block)
+    @staticmethod
+    def get_hash(
+            file_path: str,
+            algorithm: str = 'sha256',
+            block_size: int = 1024 * 1024,
+            cache: HashCache = None
+    ) -> str:
+        """
+        Calculate the hash of a file with any hashlib algorithm.
+
+        :param file_path: The path to the file to hash.
+        :param algorithm: (Optional) The hashlib algorithm name. Defaults to 'sha256'.
+        :param block_size: (Optional) The block size (in bytes) for reading the file. Defaults to 1 MiB.
+        :param cache: (Optional) A `HashCache` answering unchanged files without reading them. Defaults to None.
+        :return: The hash of the file as a hexadecimal string.
+        """
+        digest = cache.get(file_path, algorithm) if cache else None
+        if digest:
+            return digest
+
+        hashed_stat = stat(file_path) if cache else None
+        digest = File._hash_file(file_path, {algorithm: hashlib.new(algorithm)}, block_size)[algorithm].hexdigest()
+        cache.set(file_path, algorithm, digest, hashed_stat) if cache else None
+        return digest
+
+    @staticmethod
+    def hash_tree(
+            path: str,
+            algorithm: str = 'sha256',
+            workers: int = None,
+            block_size: int = 1024 * 1024,
+            extension: "tuple | str" = None,
+            exceptions_files: list = None,
+            exceptions_dirs: list = None,
+            cache: HashCache = None
+    ) -> dict[str, str]:
+        """
+        Hash all files under a directory concurrently.
+        Files are hashed on a thread pool, hashlib releases the GIL while hashing large blocks.
+
+        :param path: The directory to hash.
+        :param algorithm: (Optional) The hashlib algorithm name. Defaults to 'sha256'.
+        :param workers: (Optional) Number of hashing threads. Defaults to the `ThreadPoolExecutor` default.
+        :param block_size: (Optional) The block size (in bytes) for reading files. Defaults to 1 MiB.
+        :param extension: (Optional) Only hash files with these extensions, see `File.get_paths`.
+        :param exceptions_files: (Optional) File names to skip, see `File.get_paths`.
+        :param exceptions_dirs: (Optional) Directory names to skip, see `File.get_paths`.
+        :param cache: (Optional) A `HashCache` answering unchanged files without reading them. Defaults to None.
+        :return: Hex digests keyed by the path relative to `path` with '/' separators, sorted by path.
+        """
+        files = File.get_paths(
+            path, extension=extension, exceptions_files=exceptions_files, exceptions_dirs=exceptions_dirs
+        )
+        digests = File._hash_files(files, algorithm, workers, block_size, cache)
+        return dict(sorted((relpath(file, path).replace('\\', '/'), digest) for file, digest in digests.items()))
+
+    @staticmethod
+    def write_checksums(
+            path: str,
+            manifest_path: str = None,
+            algorithm: str = 'sha256',
+            workers: int = None,
+            stdout: bool = True,
+            extension: "tuple | str" = None,
+            exceptions_files: list = None,
+            exceptions_dirs: list = None,
+            cache: HashCache = None
+    ) -> str:
+        """
+        Write a `sha256sum`-compatible manifest ("<digest>  <relative path>" per line) for a directory.
+
+        :param path: The directory to hash.
+        :param manifest_path: (Optional) Path to the manifest. Defaults to `<path>/SHA256SUMS`
+        (named after the algorithm). The manifest itself is never hashed.
+        :param algorithm: (Optional) The hashlib algorithm name. Defaults to 'sha256'.
+        :param workers: (Optional) Number of hashing threads, see `File.hash_tree`.
+        :param stdout: (Optional) Print the manifest path when written. Defaults to True.
+        :param extension: (Optional) Only hash files with these extensions, see `File.get_paths`.
+        :param exceptions_files: (Optional) File names to skip, see `File.get_paths`.
+        :param exceptions_dirs: (Optional) Directory names to skip, see `File.get_paths`.
+        :param cache: (Optional) A `HashCache` answering unchanged files without reading them. Defaults to None.
+        :return: The path to the manifest.
+        """
+        _manifest_path = manifest_path or join(path, f"{algorithm.upper()}SUMS")
+        digests = File.hash_tree(
+            path,
+            algorithm=algorithm,
+            workers=workers,
+            extension=extension,
+            exceptions_files=(exceptions_files or []) + [basename(_manifest_path)],
+            exceptions_dirs=exceptions_dirs,
+            cache=cache
+        )
+
+        with open(_manifest_path, 'w', encoding='utf-8', newline='\n') as file:
+            file.writelines(f"{digest}  {name}\n" for name, digest in digests.items())
+
+        print(f"[green]|INFO| Checksums of {len(digests)} files written to: {_manifest_path}") if stdout else None
+        return _manifest_path
+
+    @staticmethod
+    def verify_checksums(
+            manifest_path: str,
+            dir_path: str = None,
+            algorithm: str = 'sha256',
+            workers: int = None,
+            stdout: bool = True,
+            stderr: bool = True,
+            cache: HashCache = None
+    ) -> dict[str, list]:
+        """
+        Verify files against a `sha256sum`-style manifest.
+
+        :param manifest_path: Path to the manifest.
+        :param dir_path: (Optional) Directory the manifest paths are relative to. Defaults to the manifest directory.
+        :param algorithm: (Optional) The hashlib algorithm the manifest was written with. Defaults to 'sha256'.
+        :param workers: (Optional) Number of hashing threads, see `File.hash_tree`.
+        :param stdout: (Optional) Print a summary. Defaults to True.
+        :param stderr: (Optional) Print every mismatched or missing file. Defaults to True.
+        :param cache: (Optional) A `HashCache` answering unchanged files without reading them. Defaults to None.
+        :return: A dictionary with 'ok', 'failed' and 'missing' lists of relative paths.
+        """
+        base_dir = dir_path or dirname(manifest_path)
+        expected = {}
+
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    digest, name = line.rstrip('\r\n').split(' ', 1)
+                    expected[name[1:] if name[:1] in (' ', '*') else name] = digest.lower()
+
+        result = {'ok': [], 'failed': [], 'missing': [name for name in expected if not isfile(join(base_dir, name))]}
+        paths = {join(base_dir, name): name for name in expected if name not in result['missing']}
+
+        for file_path, digest in File._hash_files(list(paths), algorithm, workers, cache=cache).items():
+            result['ok' if digest == expected[paths[file_path]] else 'failed'].append(paths[file_path])
+
+        if stderr:
+            for name in result['failed']:
+                print(f"[bold red]|CHECKSUM ERROR| Mismatch: {name}")
+            for name in result['missing']:
+                print(f"[bold red]|CHECKSUM ERROR| Missing: {name}")
+
+        if stdout:
+            print(
+                f"[{'green' if len(result['ok']) == len(expected) else 'red'}]|INFO| Checksums verified: "
+                f"{len(result['ok'])}/{len(expected)} ok, "
+                f"{len(result['failed'])} failed, {len(result['missing'])} missing"
+            )
 
-        return sha256.hexdigest()
+        return result
 
     @staticmethod
-    def get_headers(url: str, stderr: bool = False) -> Optional[CaseInsensitiveDict[str]]:
+    def find_duplicates(
+            path: str,
+            min_size: int = 1,
+            partial_size: int = 4096,
+            algorithm: str = 'sha256',
+            workers: int = None,
+            hardlink: bool = False,
+            stdout: bool = True,
+            extension: "tuple | str" = None,
+            exceptions_files: list = None,
+            exceptions_dirs: list = None,
+            cache: HashCache = None
+    ) -> list[list[str]]:
+        """
+        Find files with identical content under a directory.
+
+        Candidates are narrowed in stages so most files are never read completely: files are grouped by size,
+        then by a hash of their first and last `partial_size` bytes, and only the remaining collisions are fully
+        hashed on a thread pool. Hardlinks of one inode are read once and listed together with its duplicates.
+
+        :param path: The directory to search.
+        :param min_size: (Optional) Ignore files smaller than this many bytes. Defaults to 1, skipping empty files.
+        :param partial_size: (Optional) Number of bytes hashed at the start and at the end of each file. Defaults to 4 KiB.
+        :param algorithm: (Optional) The hashlib algorithm name. Defaults to 'sha256'.
+        :param workers: (Optional) Number of hashing threads. Defaults to the `ThreadPoolExecutor` default.
+        :param hardlink: (Optional) Replace every duplicate with a hardlink to the first path of its group.
+        Files on another device than the first path are left as they are. Defaults to False.
+        :param stdout: (Optional) Print a summary. Defaults to True.
+        :param extension: (Optional) Only include files with these extensions, see `File.get_paths`.
+        :param exceptions_files: (Optional) File names to skip, see `File.get_paths`.
+        :param exceptions_dirs: (Optional) Directory names to skip, see `File.get_paths`.
+        :param cache: (Optional) A `HashCache` answering unchanged files without reading them. Defaults to None.
+        :return: Groups of paths with identical content, each sorted, largest files first.
+        """
+        by_size, inodes = {}, {}
+        for entry in File.iter_paths(
+                path, extension=extension, exceptions_files=exceptions_files, exceptions_dirs=exceptions_dirs
+        ):
+            try:
+                _stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if entry.is_symlink() or _stat.st_size < min_size:
+                continue
+
+            # DirEntry.stat leaves st_dev and st_ino at 0 on Windows
+            key = (_stat.st_dev, _stat.st_ino) if _stat.st_ino else File._inode(entry.path)
+            if key not in inodes:
+                by_size.setdefault(_stat.st_size, []).append(entry.path)
+            inodes.setdefault(key, []).append(entry.path)
+
+        candidates = {size: paths for size, paths in by_size.items() if len(paths) > 1}
+        partial = File._hash_files(
+            [file_path for paths in candidates.values() for file_path in paths],
+            algorithm,
+            workers,
+            hasher=lambda file_path: File._hash_edges(file_path, algorithm, partial_size)
+        )
+
+        groups = {}
+        for size, paths in candidates.items():
+            for file_path in paths:
+                groups.setdefault((size, partial[file_path]), []).append(file_path)
+
+        full = File._hash_files(
+            [
+                file_path for (size, _), paths in groups.items()
+                if len(paths) > 1 and size > 2 * partial_size for file_path in paths
+            ],
+            algorithm,
+            workers,
+            cache=cache
+        )
+
+        duplicates = {}
+        for (size, digest), paths in groups.items():
+            if len(paths) > 1:
+                for file_path in paths:
+                    duplicates.setdefault((size, full.get(file_path, digest)), []).append(file_path)
+
+        result, redundant = [], 0
+        for (size, _), paths in sorted(duplicates.items(), key=lambda item: -item[0][0]):
+            if len(paths) > 1:
+                result.append(sorted(linked for file_path in paths for linked in inodes[File._inode(file_path)]))
+                redundant += size * (len(paths) - 1)
+
+        linked = File._hardlink_duplicates(result) if hardlink else 0
+
+        if stdout:
+            print(
+                f"[green]|INFO| Found {len(result)} groups of duplicates, {redundant} redundant bytes"
+                f"{f', {linked} files hardlinked' if hardlink else ''}: {path}"
+            )
+
+        return result
+
+    @staticmethod
+    def _hash_edges(file_path: str, algorithm: str, size: int) -> str:
+        """
+        Hash the first and last `size` bytes of a file, the whole file if it is not larger than `2 * size`.
+        """
+        hasher = hashlib.new(algorithm)
+        with open(file_path, 'rb', buffering=0) as file:
+            file_size = fstat(file.fileno()).st_size
+            if file_size <= 2 * size:
+                hasher.update(file.read())
+            else:
+                hasher.update(file.read(size))
+                file.seek(-size, 2)
+                hasher.update(file.read(size))
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _inode(file_path: str) -> tuple[int, int]:
+        _stat = stat(file_path, follow_symlinks=False)
+        return _stat.st_dev, _stat.st_ino
+
+    @staticmethod
+    def _hardlink_duplicates(groups: list[list[str]]) -> int:
+        """
+        Replace the files of every group with hardlinks to its first file, through a temporary link and an atomic rename.
+
+        :return: The number of replaced files.
+        """
+        replaced = 0
+        for group in groups:
+            source = group[0]
+            source_inode = File._inode(source)
+            for file_path in group[1:]:
+                inode = File._inode(file_path)
+                if inode == source_inode or inode[0] != source_inode[0]:
+                    continue
+
+                tmp_path = f"{file_path}.{getpid()}.link"
+                link(source, tmp_path)
+                try:
+                    replace(tmp_path, file_path)
+                except OSError:
+                    remove(tmp_path)
+                    raise
+                replaced += 1
+
+        return replaced
+
+    @staticmethod
+    def _hash_files(
+            paths: list,
+            algorithm: str = 'sha256',
+            workers: int = None,
+            block_size: int = 1024 * 1024,
+            cache: HashCache = None,
+            hasher: Callable[[str], str] = None
+    ) -> dict[str, str]:
+        """
+        Hash files on a thread pool.
+
+        :param hasher: (Optional) Function returning the digest of a path, instead of `File.get_hash`.
+        :return: Hex digests keyed by file path.
+        """
+        _hasher = hasher or (lambda path: File.get_hash(path, algorithm, block_size, cache))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(paths, executor.map(_hasher, paths)))
+
+    @staticmethod
+    def _hash_file(path: str, hashers: dict, block_size: int = 1024 * 1024) -> dict:
+        """
+        Feed the content of a file to several hashlib objects in a single read,
+        reading into one reused buffer instead of allocating a new bytes object per block.
+        """
+        if hashers:
+            buffer = bytearray(block_size)
+            view = memoryview(buffer)
+            with open(path, 'rb', buffering=0) as file:
+                while size := file.readinto(buffer):
+                    for hasher in hashers.values():
+                        hasher.update(view[:size])
+        return hashers
+
+    @staticmethod
+    def get_headers(url: str, stderr: bool = False, session: Session = None) -> Optional[CaseInsensitiveDict[str]]:
         """
         Retrieve headers from a given URL.
 
         :param url: The URL from which to retrieve headers.
         :param stderr: (Optional) If True, prints a warning message when unable to retrieve headers. Defaults to False.
+        :param session: (Optional) A `requests.Session` to send the request through. Defaults to None.
         :return: A dictionary containing the headers if the request is successful, None otherwise.
         """
-        status = head(url)
+        status = (session.head if session else head)(url, allow_redirects=True)
 
         if status.status_code == 200:
             return status.headers
@@ -67,37 +467,638 @@ class File:
             process_bar: bool = True,
             stdout: bool = True,
             stderr: bool = True,
-            chunk_size: int = 1024 * 1024
-    ) -> None:
+            chunk_size: int = 1024 * 1024,
+            connections: int = 1,
+            resume: bool = False,
+            session: Session = None,
+            cache: DownloadCache = None,
+            sha256: str = None,
+            digests: "tuple | list | str" = None,
+            expected: dict = None
+    ) -> DownloadResult:
         """
         :param chunk_size:
         :param url: download link
         :param dir_path: download folder
         :param name: download filename
         :param process_bar: Enables/disables the file upload status bar display,
-        only 1 status bar can be displayed at a time.
+        only 1 status bar can be displayed at a time, use `File.download_many` for several files.
         :param stdout: Enable/disable display of successful download messages
         :param stderr: Enable/disable display of error messages
+        :param connections: Number of parallel connections. Values above 1 download the file in byte ranges
+        when the server reports `Accept-Ranges: bytes` and `Content-Length`, otherwise a single stream is used.
+        :param resume: Download into `<name>.part` with a `<name>.part.json` journal of completed byte ranges.
+        An interrupted download continues from the journal on the next call if the server's strong `ETag`
+        or `Last-Modified` is unchanged, otherwise it starts over. The file is renamed to its final path only when complete.
+        Downloads through a `cache` use a private file of the cache instead and are not resumed across calls.
+        :param session: (Optional) A `requests.Session` to reuse connections between downloads.
+        :param cache: (Optional) A `DownloadCache`. Cached URLs are revalidated with a conditional request
+        and served from the cache when the server answers 304 Not Modified.
+        :param sha256: (Optional) Expected SHA-256 of the file. A cached file with this digest is used without any
+        request, a downloaded file with another digest raises ValueError and is removed.
+        :param digests: (Optional) hashlib algorithm names, e.g. ('sha256', 'md5'), computed over the streamed
+        chunks while downloading. Ranged downloads (`connections` > 1 or `resume`) hash the file once complete.
+        :param expected: (Optional) Expected hex digests by algorithm name, e.g. {'md5': '...'}. They are computed
+        too, on mismatch the file is removed and ValueError is raised.
+        :return: A `DownloadResult` with the file size, download duration and computed digests.
         """
-
         Dir.create(dir_path, stdout=False)
+        _path = join(dir_path, name if name else basename(url))
 
-        _name = name if name else basename(url)
-        _path = join(dir_path, _name)
+        with File._download_progress(process_bar) as progress:
+            task = progress.add_task(f'[red] Downloading: {basename(_path)}', total=None)
+            result, headers = File._download(
+                url, _path, chunk_size, connections, resume, session, progress, task, cache, sha256, digests, expected
+            )
 
-        with get(url, stream=True) as request:
-            request.raise_for_status()
-            with open(_path, 'wb') as file:
-                _iter = request.iter_content(chunk_size=chunk_size)
-                for chunk in track(_iter, description=f'[red] Downloading: {_name}') if process_bar else _iter:
-                    if chunk:
-                        file.write(chunk)
+        length = headers.get('Content-Length', '') if headers else ''
+        server_size = int(length) if result.status == 'downloaded' and length.isdigit() else None
 
         if stdout:
             print(f"[bold green]|INFO| File Saved to: {_path}" if isfile(_path) else f"[red]|WARNING| Not exist")
 
-        if stderr and int(getsize(_path)) != int(request.headers['Content-Length']):
-            print(f"[red]|WARNING| Size different\nFile:{getsize(_path)}\nServer:{request.headers['Content-Length']}")
+        if stderr and server_size is not None and result.size != server_size:
+            print(f"[red]|WARNING| Size different\nFile:{result.size}\nServer:{server_size}")
+
+        return result
+
+    @staticmethod
+    def download_many(
+            jobs: "list[tuple[str, str] | tuple[str, str, str]]",
+            workers: int = 8,
+            process_bar: bool = True,
+            stdout: bool = True,
+            stderr: bool = True,
+            chunk_size: int = 1024 * 1024,
+            connections: int = 1,
+            resume: bool = False,
+            cache: DownloadCache = None,
+            digests: "tuple | list | str" = None
+    ) -> list[DownloadResult]:
+        """
+        Download several files concurrently over one pooled `requests.Session`.
+
+        :param jobs: A list of (url, dir_path) or (url, dir_path, name) tuples.
+        :param workers: (Optional) Maximum number of files downloaded at the same time. Defaults to 8.
+        :param process_bar: (Optional) Show a single progress display with a bar per active download. Defaults to True.
+        :param stdout: (Optional) Print a summary when all jobs are finished. Defaults to True.
+        :param stderr: (Optional) Print an error message for every failed job. Defaults to True.
+        :param chunk_size: (Optional) Size of the chunks read from the responses. Defaults to 1 MiB.
+        :param connections: (Optional) Parallel connections per file, see `File.download`. Defaults to 1.
+        :param resume: (Optional) Use resumable downloads, see `File.download`. Defaults to False.
+        :param cache: (Optional) A `DownloadCache` shared by all jobs, see `File.download`. Defaults to None.
+        :param digests: (Optional) hashlib algorithm names computed for every file, see `File.download`.
+        :return: A list of `DownloadResult` in the order of `jobs`, failed jobs have status 'failed'.
+        """
+        started = perf_counter()
+        pool_size = max(1, workers) * max(1, connections)
+
+        with Session() as session, File._download_progress(process_bar) as progress:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            overall = progress.add_task(f'[green] Files: 0/{len(jobs)}', total=None)
+            finished = []
+
+            def run(job: tuple) -> DownloadResult:
+                url, dir_path, name = (*job, None)[:3]
+                _path = join(dir_path, name if name else basename(url))
+                task = progress.add_task(f'[red] Downloading: {basename(_path)}', total=None)
+                job_started = perf_counter()
+                try:
+                    Dir.create(dir_path, stdout=False)
+                    result, _ = File._download(
+                        url, _path, chunk_size, connections, resume, session, progress, task, cache, digests=digests
+                    )
+                except Exception as e:
+                    result = DownloadResult(url, _path, 'failed', duration=perf_counter() - job_started, error=str(e))
+                    print(f"[bold red]|DOWNLOAD ERROR| {url}\n{e}") if stderr else None
+                finished.append(result)
+                progress.update(task, visible=False)
+                progress.update(
+                    overall, description=f'[green] Files: {len(finished)}/{len(jobs)}', advance=result.size
+                )
+                return result
+
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                results = list(executor.map(run, jobs))
+
+        if stdout:
+            downloaded = [result for result in results if result.ok]
+            print(
+                f"[bold green]|INFO| Downloaded {len(downloaded)}/{len(results)} files, "
+                f"{sum(result.size for result in downloaded)} bytes in {perf_counter() - started:.2f}s"
+            )
+
+        return results
+
+    @staticmethod
+    def _download(
+            url: str,
+            path: str,
+            chunk_size: int,
+            connections: int,
+            resume: bool,
+            session: Optional[Session],
+            progress: Progress,
+            task: TaskID,
+            cache: DownloadCache = None,
+            sha256: str = None,
+            digests: "tuple | list | str" = None,
+            expected: dict = None
+    ) -> "tuple[DownloadResult, Optional[CaseInsensitiveDict[str]]]":
+        """
+        Download `url` to `path` reporting transferred bytes to a progress task.
+
+        :return: The `DownloadResult` and the response headers, if a request was made.
+        """
+        started = perf_counter()
+        expected = {
+            name.lower(): value.lower() for name, value in {**(expected or {}), 'sha256': sha256}.items() if value
+        }
+        names = {*([digests] if isinstance(digests, str) else digests or ()), *expected}
+
+        if cache:
+            status, headers, computed = File._download_cached(
+                url, path, chunk_size, connections, session, progress, task, cache, names, expected
+            )
+        else:
+            hashers = {name: hashlib.new(name) for name in names}
+            headers = File._fetch(url, path, chunk_size, connections, resume, session, progress, task, hashers)
+            status, computed = 'downloaded', {name: hasher.hexdigest() for name, hasher in hashers.items()}
+            File._check_digests(url, path, computed, expected)
+
+        return DownloadResult(url, path, status, getsize(path), perf_counter() - started, digests=computed), headers
+
+    @staticmethod
+    def _download_cached(
+            url: str,
+            path: str,
+            chunk_size: int,
+            connections: int,
+            session: Optional[Session],
+            progress: Progress,
+            task: TaskID,
+            cache: DownloadCache,
+            names: set,
+            expected: dict
+    ) -> "tuple[str, Optional[CaseInsensitiveDict[str]], dict]":
+        """
+        Serve `url` from the cache or download it into the cache, then place it at `path`.
+
+        :return: 'cached' or 'downloaded', the response headers if a request was made, and the computed digests.
+        """
+        entry, headers, blob_path = cache.get(url), None, None
+        tmp_path = cache.tmp_path(url)
+        hashers = {name: hashlib.new(name) for name in names | {'sha256'}}
+
+        try:
+            if expected.get('sha256') and cache.has(expected['sha256']):
+                blob_path = cache.blob_path(expected['sha256'])
+
+            elif entry:
+                conditional = DownloadCache.conditional_headers(entry)
+                with (session.get if session else get)(url, headers=conditional, stream=True) as request:
+                    headers = request.headers
+                    if request.status_code == 304:
+                        blob_path = cache.blob_path(entry['sha256'])
+                    else:
+                        request.raise_for_status()
+                        File._write_response(request, tmp_path, chunk_size, progress, task, hashers)
+
+            else:
+                headers = File._fetch(url, tmp_path, chunk_size, connections, False, session, progress, task, hashers)
+        except BaseException:
+            remove(tmp_path) if exists(tmp_path) else None
+            raise
+
+        if blob_path:
+            status = 'cached'
+            sha256 = basename(blob_path)
+            with cache.lock:  # the blob must not be evicted before it is placed at `path`
+                File._materialize(blob_path, path, cache.link)
+                cache.touch(sha256)
+            File._hash_file(path, {name: hasher for name, hasher in hashers.items() if name != 'sha256'})
+            computed = {name: sha256 if name == 'sha256' else hasher.hexdigest() for name, hasher in hashers.items()}
+            File._check_digests(url, path, computed, expected)
+            progress.update(task, total=getsize(path), completed=getsize(path))
+        else:
+            status = 'downloaded'
+            computed = {name: hasher.hexdigest() for name, hasher in hashers.items()}
+            File._check_digests(url, tmp_path, computed, expected)
+            with cache.lock:
+                blob_path = cache.store(
+                    url, tmp_path, computed['sha256'], headers.get('ETag'), headers.get('Last-Modified')
+                )
+                File._materialize(blob_path, path, cache.link)
+
+        return status, headers, {name: computed[name] for name in names}
+
+    @staticmethod
+    def _check_digests(url: str, path: str, computed: dict, expected: dict, delete: bool = True) -> None:
+        """
+        Raise ValueError if a computed digest differs from the expected one, removing the file at `path` first.
+        """
+        mismatches = [f"{name}: expected {value}, got {computed[name]}" for name, value in expected.items()
+                      if computed[name] != value]
+        if mismatches:
+            remove(path) if delete and exists(path) else None
+            raise ValueError(f"Digest mismatch, url: {url}\n" + "\n".join(mismatches))
+
+    @staticmethod
+    def _fetch(
+            url: str,
+            path: str,
+            chunk_size: int,
+            connections: int,
+            resume: bool,
+            session: Optional[Session],
+            progress: Progress,
+            task: TaskID,
+            hashers: dict = None
+    ) -> Optional[CaseInsensitiveDict[str]]:
+        """
+        Download `url` to `path` in ranges or as a single stream.
+
+        :param hashers: (Optional) hashlib objects by name, fed with the content of the file. Streamed bodies are
+        hashed chunk by chunk, ranged downloads arrive out of order and are hashed once the file is complete.
+        :return: Headers of the response, or of the HEAD request for ranged downloads.
+        """
+        part_path = f"{path}.part"
+
+        headers = File.get_headers(url, session=session) if connections > 1 or resume else None
+
+        if File._accepts_ranges(headers):
+            server_size = int(headers['Content-Length'])
+            journal = DownloadJournal.load(
+                f"{part_path}.json",
+                url,
+                server_size,
+                etag=headers.get('ETag'),
+                last_modified=headers.get('Last-Modified')
+            ) if resume else None
+
+            if not journal or not journal.ranges or not isfile(part_path):
+                with open(part_path if resume else path, 'wb') as file:
+                    file.truncate(server_size)
+                if journal:
+                    journal.ranges = []
+
+            try:
+                File._download_ranges(
+                    url, part_path if resume else path, server_size, connections, chunk_size,
+                    progress, task, journal, session
+                )
+            except _RangeRefused:
+                pass  # the file changed since the journal was written, download it again as a single stream
+            else:
+                if journal:
+                    replace(part_path, path)
+                    journal.delete()
+
+                File._hash_file(path, hashers or {})
+                return headers
+
+        remove(f"{part_path}.json") if resume and exists(f"{part_path}.json") else None
+        headers = File._download_stream(
+            url, part_path if resume else path, chunk_size, progress, task, session, hashers
+        )
+        replace(part_path, path) if resume else None
+        return headers
+
+    @staticmethod
+    def _materialize(src: str, dst: str, link_mode: "str | tuple" = 'auto') -> str:
+        """
+        Place a copy of `src` at `dst` using a reflink, a hardlink or a plain copy.
+
+        :param link_mode: 'reflink', 'hardlink', 'copy' or 'auto' to try a reflink and fall back to a copy,
+        or a tuple of these modes to try in the given order. A hardlink is only made when asked for explicitly,
+        since writing to `dst` would then also change `src`.
+        :return: The method that was used.
+        """
+        if isinstance(link_mode, tuple):
+            modes = link_mode
+        else:
+            modes = ('reflink', 'copy') if link_mode == 'auto' else (link_mode,)
+        error = None
+
+        if exists(dst) and realpath(src) == realpath(dst):
+            raise SameFileError(f"{src!r} and {dst!r} are the same file")
+
+        for mode in modes:
+            remove(dst) if lexists(dst) else None
+            try:
+                if mode == 'reflink':
+                    File._reflink(src, dst)
+                elif mode == 'hardlink':
+                    link(src, dst)
+                else:
+                    File._copy_data(src, dst)
+                return mode
+            except OSError as e:
+                error = e
+
+        remove(dst) if lexists(dst) else None
+        raise error
+
+    @staticmethod
+    def _reflink(src: str, dst: str) -> None:
+        """
+        Clone `src` into `dst` with the FICLONE ioctl, sharing data blocks on btrfs/XFS.
+        Raises OSError if the platform or filesystem does not support it.
+        """
+        if ioctl is None:
+            raise OSError('Reflinks are not supported on this platform')
+
+        with open(src, 'rb') as _src, open(dst, 'wb') as _dst:
+            ioctl(_dst.fileno(), File.FICLONE, _src.fileno())
+
+    @staticmethod
+    def _copy_data(
+            src: str,
+            dst: str,
+            on_copy: Callable[[int], None] = None,
+            chunk_size: int = 8 * 1024 * 1024
+    ) -> str:
+        """
+        Copy the content of `src` to `dst`, inside the kernel where possible: a FICLONE reflink,
+        then `os.copy_file_range`, then `os.sendfile`, then a buffered copy.
+        Sparse files are copied extent by extent with SEEK_DATA/SEEK_HOLE, so their holes are preserved.
+
+        :param on_copy: (Optional) Called with the number of bytes copied after every chunk, skipped holes included.
+        :param chunk_size: (Optional) Number of bytes copied per call. Defaults to 8 MiB.
+        :return: The method that was used: 'reflink', 'sparse', 'copy_file_range', 'sendfile' or 'copy'.
+        """
+        File._check_not_same(src, dst)
+
+        with open(src, 'rb') as _src, open(dst, 'wb') as _dst:
+            fd_in, fd_out = _src.fileno(), _dst.fileno()
+            src_stat = fstat(fd_in)
+
+            if ioctl is not None:
+                try:
+                    ioctl(fd_out, File.FICLONE, fd_in)
+                    on_copy(src_stat.st_size) if on_copy else None
+                    return 'reflink'
+                except OSError:
+                    pass
+
+            if SEEK_DATA is not None and getattr(src_stat, 'st_blocks', src_stat.st_size) * 512 < src_stat.st_size:
+                try:
+                    File._copy_sparse(fd_in, fd_out, src_stat.st_size, on_copy, chunk_size)
+                    return 'sparse'
+                except OSError:
+                    lseek(fd_in, 0, 0)
+                    ftruncate(fd_out, 0)
+                    lseek(fd_out, 0, 0)
+
+            for method, function in (('copy_file_range', copy_file_range), ('sendfile', sendfile)):
+                if function is None:
+                    continue
+
+                offset = 0
+                while True:
+                    try:
+                        if method == 'copy_file_range':
+                            copied = function(fd_in, fd_out, chunk_size)
+                        else:
+                            copied = function(fd_out, fd_in, offset, chunk_size)
+                    except OSError:
+                        if offset:
+                            raise
+                        break
+
+                    if not copied:
+                        return method
+
+                    offset += copied
+                    on_copy(copied) if on_copy else None
+
+            buffer = bytearray(chunk_size)
+            view = memoryview(buffer)
+            while size := _src.readinto(buffer):
+                _dst.write(view[:size])
+                on_copy(size) if on_copy else None
+
+        return 'copy'
+
+    @staticmethod
+    def _check_not_same(src: str, dst: str) -> None:
+        """
+        Raise `shutil.SameFileError` like `shutil.copyfile` if `dst` is `src` or a hardlink of it,
+        opening `dst` for writing would truncate the source.
+        """
+        if exists(dst) and samefile(src, dst):
+            raise SameFileError(f"{src!r} and {dst!r} are the same file")
+
+    @staticmethod
+    def _copy_sparse(
+            fd_in: int,
+            fd_out: int,
+            size: int,
+            on_copy: Callable[[int], None] = None,
+            chunk_size: int = 8 * 1024 * 1024
+    ) -> None:
+        """
+        Copy only the data extents of a sparse file and extend the destination to `size`, leaving holes unallocated.
+        Raises OSError if the filesystem does not support SEEK_DATA/SEEK_HOLE.
+        """
+        offset, use_copy_range = 0, copy_file_range is not None
+
+        while offset < size:
+            try:
+                data = lseek(fd_in, offset, SEEK_DATA)
+            except OSError as e:
+                if e.errno != ENXIO:
+                    raise
+                break
+
+            hole = lseek(fd_in, data, SEEK_HOLE)
+            on_copy(data - offset) if on_copy and data > offset else None
+
+            position = data
+            while position < hole:
+                length = min(chunk_size, hole - position)
+                copied = 0
+                if use_copy_range:
+                    try:
+                        copied = copy_file_range(fd_in, fd_out, length, position, position)
+                    except OSError:
+                        use_copy_range = False
+                if not use_copy_range:
+                    copied = pwrite(fd_out, pread(fd_in, length, position), position)
+                if not copied:
+                    break
+
+                position += copied
+                on_copy(copied) if on_copy else None
+
+            offset = hole
+
+        on_copy(size - offset) if on_copy and size > offset else None
+        ftruncate(fd_out, size)
+
+    @staticmethod
+    def _accepts_ranges(headers: Optional[CaseInsensitiveDict[str]]) -> bool:
+        if not headers or headers.get('Accept-Ranges', '').lower() != 'bytes':
+            return False
+        return headers.get('Content-Length', '').isdigit() and int(headers['Content-Length']) > 0
+
+    @staticmethod
+    def _download_progress(enabled: bool = True) -> Progress:
+        return Progress(
+            TextColumn('{task.description}'),
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TimeRemainingColumn(),
+            disable=not enabled
+        )
+
+    @staticmethod
+    def _download_stream(
+            url: str,
+            path: str,
+            chunk_size: int,
+            progress: Progress,
+            task: TaskID,
+            session: Session = None,
+            hashers: dict = None
+    ) -> CaseInsensitiveDict[str]:
+        """
+        Download the whole body over a single streamed request.
+
+        :return: Headers of the response.
+        """
+        with (session.get if session else get)(url, stream=True) as request:
+            request.raise_for_status()
+            File._write_response(request, path, chunk_size, progress, task, hashers)
+            return request.headers
+
+    @staticmethod
+    def _write_response(
+            request: Response,
+            path: "str | BinaryIO",
+            chunk_size: int,
+            progress: Progress,
+            task: TaskID,
+            hashers: dict = None
+    ) -> None:
+        """
+        Write the body of a streamed response to `path` or to an open binary file,
+        updating `hashers` with every chunk.
+        """
+        length = request.headers.get('Content-Length', '')
+        progress.update(task, total=int(length) if length.isdigit() else None, completed=0)
+
+        with open(path, 'wb') if isinstance(path, str) else nullcontext(path) as file:
+            for chunk in request.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    file.write(chunk)
+                    progress.update(task, completed=request.raw.tell())  # received bytes, like `Content-Length`
+                    for hasher in (hashers or {}).values():
+                        hasher.update(chunk)
+
+    @staticmethod
+    def _split_ranges(ranges: list[tuple[int, int]], parts: int) -> list[tuple[int, int]]:
+        """
+        Cut inclusive byte ranges into segments of roughly equal size so that about `parts` of them are produced.
+        """
+        step = max(1, -(-sum(end - start + 1 for start, end in ranges) // max(1, parts)))
+        return [
+            (offset, min(offset + step, end + 1) - 1)
+            for start, end in ranges
+            for offset in range(start, end + 1, step)
+        ]
+
+    @staticmethod
+    def _download_ranges(
+            url: str,
+            path: str,
+            size: int,
+            connections: int,
+            chunk_size: int,
+            progress: Progress,
+            task: TaskID,
+            journal: DownloadJournal = None,
+            session: Session = None
+    ) -> None:
+        """
+        Download the file in concurrent byte ranges into a preallocated file of `size` bytes.
+        With a journal, only its missing ranges are fetched and every written chunk is recorded in it.
+        """
+        ranges = journal.missing() if journal else [(0, size - 1)]
+        segments = File._split_ranges(ranges, connections)
+        progress.update(task, total=size, completed=size - sum(end - start + 1 for start, end in ranges))
+
+        def on_chunk(offset: int, length: int) -> None:
+            journal.add(offset, length) if journal else None
+            progress.advance(task, length)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(connections, len(segments)))) as executor:
+                futures = [
+                    executor.submit(
+                        File._download_range, url, path, start, end, chunk_size, on_chunk,
+                        journal.validator if journal else None, session
+                    )
+                    for start, end in segments
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            journal.save() if journal else None
+
+    @staticmethod
+    def _download_range(
+            url: str,
+            path: str,
+            start: int,
+            end: int,
+            chunk_size: int,
+            on_chunk=None,
+            if_range: str = None,
+            session: Session = None
+    ) -> None:
+        """
+        Fetch the inclusive byte range `start`-`end` and write it at the same offset of an existing file.
+        Raises ConnectionError if the `Content-Range` or the length of the body does not match the request.
+
+        :param on_chunk: (Optional) Callback called with the offset and length of every written chunk.
+        :param if_range: (Optional) Strong `ETag` or `Last-Modified` value, the server answers with the full body
+        instead of the range if the file has changed, which raises `_RangeRefused`.
+        :param session: (Optional) A `requests.Session` to send the request through.
+        """
+        headers = {'Range': f'bytes={start}-{end}'}
+        if if_range:
+            headers['If-Range'] = if_range
+
+        with (session.get if session else get)(url, headers=headers, stream=True) as request:
+            request.raise_for_status()
+            if request.status_code != 206:
+                raise _RangeRefused(f"Server ignored Range request, status: {request.status_code}, url: {url}")
+
+            content_range = request.headers.get('Content-Range', '')
+            if not content_range.startswith(f'bytes {start}-{end}/'):
+                raise ConnectionError(
+                    f"Server sent another range, requested: bytes {start}-{end}, "
+                    f"got: {content_range or 'no Content-Range'}, url: {url}"
+                )
+
+            with open(path, 'r+b') as file:
+                file.seek(start)
+                offset = start
+                for chunk in request.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        if offset + len(chunk) > end + 1:
+                            raise ConnectionError(f"Server sent more than bytes {start}-{end}, url: {url}")
+                        file.write(chunk)
+                        file.flush()
+                        on_chunk(offset, len(chunk)) if on_chunk else None
+                        offset += len(chunk)
+
+            if offset != end + 1:
+                raise ConnectionError(f"Range bytes {start}-{end} ended after {offset - start} bytes, url: {url}")
 
     @staticmethod
     def read(file_path: str, mode: str = 'r', encoding='utf-8') -> str:
@@ -151,7 +1152,9 @@ class File:
             path: "str | tuple | list",
             stdout: bool = True,
             stderr: bool = True,
-            full_access: bool = False
+            full_access: bool = False,
+            workers: int = None,
+            background: bool = False
     ) -> None:
         """
         Delete files or directories with optional full access permission.
@@ -160,6 +1163,8 @@ class File:
         :param stdout: Whether to print informational messages to stdout. Defaults to True.
         :param stderr: Whether to print error messages to stderr. Defaults to True.
         :param full_access: If True, sets full access permissions (0o777) before deletion. Defaults to False.
+        :param workers: (Optional) Number of threads deleting directories, see `Dir.remove_tree`. Defaults to None.
+        :param background: (Optional) Delete directories in the background, see `Dir.remove_tree`. Defaults to False.
         """
         if not path:
             return print(f"[red]|DELETE ERROR| Path should be string, tuple or list not {path}") if stderr else None
@@ -170,11 +1175,18 @@ class File:
                 print(f"[bold red]|DELETE WARNING| File not exist: {object_path}") if stderr else ...
                 continue
 
-            chmod(path, 0o777) if full_access else None
-
             if isdir(object_path):
-                Dir.delete(object_path, clear_dir=_path.endswith("*"), stdout=stdout, stderr=stderr)
+                Dir.delete(
+                    object_path,
+                    clear_dir=_path.endswith("*"),
+                    stdout=stdout,
+                    stderr=stderr,
+                    full_access=full_access,
+                    workers=workers,
+                    background=background
+                )
             else:
+                chmod(object_path, 0o777) if full_access else None
                 remove(object_path)
 
             if stderr and exists(object_path):
@@ -245,7 +1257,9 @@ class File:
             stderr: bool = True,
             progress_bar: bool = True,
             comment: str = None,
-            comment_encoding: str = 'utf-8'
+            comment_encoding: str = 'utf-8',
+            workers: int = None,
+            incremental: bool = False
     ) -> None:
         """
         :param stdout:
@@ -257,42 +1271,230 @@ class File:
         :param delete:  Deleting files after compression.
         :param comment: Additional information to store in archive metadata.
         :param comment_encoding: Encoding of the comment.
+        :param workers: Number of threads compressing directory members in parallel. The compressed members
+        are written to the archive in the same order as with sequential compression, see `_write_members`
+        for the Python versions this is verified on. Defaults to None (sequential).
+        :param incremental: Update an existing archive: members whose size, modification date, compression type
+        and CRC32 are unchanged are copied without recompressing, new and modified files are compressed, and members
+        of removed files are dropped. The existing comment is kept unless `comment` is given. Defaults to False.
         """
         _name = basename(Str.delete_last_slash(path))
         _archive_path = archive_path or join(dirname(path) if isfile(path) else path, f"{_name}.zip")
+        _tmp_path = f"{_archive_path}.tmp"
 
         if not exists(path):
             return print(f'[red]|COMPRESS WARNING| Path for compression does not exist: {path}') if stderr else None
 
         Dir.create(dirname(_archive_path), stdout=False)
 
-        with ZipFile(_archive_path, 'w') as _zip:
-            if isdir(path):
-                print(f'[green]|INFO| Compressing dir: {path}') if stdout else None
-
-                files = File.get_paths(path, exceptions_files=File.EXCEPTIONS + [f"{basename(_archive_path)}"])
-                _iter = track(files, description=f"[green]|INFO| Compressing dir: {_name}") if progress_bar else files
-
-                for file in _iter:
-                    _zip.write(file, relpath(file, path), compress_type=compress_type)
-
-                if delete:
-                    _archive_name = basename(_archive_path)
-                    File.delete([join(path, obj) for obj in listdir(path) if obj != _archive_name], stdout=False)
+        if isdir(path):
+            print(f'[green]|INFO| Compressing dir: {path}') if stdout else None
+            files = File.iter_paths(
+                path, exceptions_files=File.EXCEPTIONS + [basename(_archive_path), basename(_tmp_path)]
+            )
+            members = ((entry.path, relpath(entry.path, path)) for entry in files)
+            if progress_bar:
+                members = list(members)
+                members = track(members, description=f"[green]|INFO| Compressing dir: {_name}", total=len(members))
+        else:
+            print(f'[green]|INFO| Compressing file: {path}') if stdout else None
+            members = [(path, _name)]
 
-            else:
-                print(f'[green]|INFO| Compressing file: {path}') if stdout else None
-                _zip.write(path, _name, compress_type=compress_type)
-                File.delete(path, stdout=False) if delete else None
+        previous = ZipFile(_archive_path) if incremental and is_zipfile(_archive_path) else None
 
-            if comment:
-                _zip.comment = comment.encode(comment_encoding)
+        try:
+            with ZipFile(_tmp_path if previous else _archive_path, 'w') as _zip:
+                reused = File._write_members(_zip, members, compress_type, workers, previous)
+
+                if comment or previous and previous.comment:
+                    _zip.comment = comment.encode(comment_encoding) if comment else previous.comment
+        except BaseException:
+            remove(_tmp_path) if previous and exists(_tmp_path) else None
+            raise
+        finally:
+            previous.close() if previous else None
+
+        if previous:
+            replace(_tmp_path, _archive_path)
+            print(f"[green]|INFO| Reused {reused} unchanged members of: {_archive_path}") if stdout else None
+
+        if delete and isdir(path):
+            _archive_name = basename(_archive_path)
+            File.delete([join(path, obj) for obj in listdir(path) if obj != _archive_name], stdout=False)
+        elif delete:
+            File.delete(path, stdout=False)
 
         if stderr and not exists(_archive_path) or getsize(_archive_path) == 0:
             return print(f"[ERROR] Archive not exists: {_archive_path}")
 
         print(f"[green]|INFO| Success compressed: {_archive_path}") if stdout else None
 
+    @staticmethod
+    def _write_members(
+            archive: ZipFile,
+            members,
+            compress_type: int,
+            workers: int = None,
+            previous: ZipFile = None
+    ) -> int:
+        """
+        Write (path, arcname) members to an archive opened for writing.
+
+        Without `workers` and `previous` members are written with `ZipFile.write`. Otherwise members are compressed,
+        or checked and copied raw from `previous` when unchanged, on a thread pool (zlib, bz2 and lzma release the GIL)
+        and appended in order by this thread. At most `workers * 2` prepared members wait for the writer.
+
+        Appending compressed data relies on private `zipfile` internals, verified on CPython 3.11 and 3.12.
+        Where they are missing every member is compressed again with `ZipFile.write`.
+
+        :return: The number of members copied from `previous`.
+        """
+        if not previous and not (workers and workers > 1) or not File._can_write_compressed(archive):
+            for file, arcname in members:
+                archive.write(file, arcname, compress_type=compress_type)
+            return 0
+
+        reused, window = 0, max(2, (workers or 1) * 2)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers or 1)) as executor:
+            pending = deque()
+            try:
+                for file, arcname in members:
+                    pending.append(executor.submit(File._prepare_member, file, arcname, compress_type, previous))
+
+                    while len(pending) >= window:
+                        info, data, unchanged = pending.popleft().result()
+                        File._write_compressed(archive, info, data)
+                        reused += unchanged
+
+                while pending:
+                    info, data, unchanged = pending.popleft().result()
+                    File._write_compressed(archive, info, data)
+                    reused += unchanged
+            except BaseException:
+                for future in pending:
+                    if not future.cancel() and not future.exception():
+                        future.result()[1].close()
+                raise
+
+        return reused
+
+    @staticmethod
+    def _prepare_member(path: str, arcname: str, compress_type: int, previous: ZipFile = None) -> tuple:
+        """
+        :return: The `ZipInfo` and compressed data of a member, and True if they were taken from `previous`.
+        """
+        member = File._unchanged_member(previous, path, arcname, compress_type) if previous else None
+        return (*member, True) if member else (*File._compress_member(path, arcname, compress_type), False)
+
+    @staticmethod
+    def _unchanged_member(previous: ZipFile, path: str, arcname: str, compress_type: int):
+        """
+        Find the member of `path` in a previous archive if the file has the same size, modification date and CRC32
+        and the member uses the same compression type. Zip dates have a 2 second resolution, so once size and date
+        match the CRC of the file is computed to catch edits that kept the size within the same 2 seconds.
+
+        :return: A new `ZipInfo` for the member and the previous archive opened at its compressed data, or None.
+        """
+        info = ZipInfo.from_file(path, arcname)
+        try:
+            old = previous.getinfo(info.filename)
+        except KeyError:
+            return None
+
+        if (old.file_size, old.compress_type) != (info.file_size, compress_type) or old.flag_bits & 0x01 \
+                or not 0 <= stat(path).st_mtime - mktime(old.date_time + (0, 0, -1)) < 2:
+            return None
+
+        crc = 0
+        with open(path, 'rb') as file:
+            while block := file.read(1024 * 1024):
+                crc = crc32(block, crc)
+        if crc != old.CRC:
+            return None
+
+        data = open(previous.filename, 'rb')
+        data.seek(old.header_offset)
+        header = data.read(30)
+        if len(header) != 30 or header[:4] != b'PK\x03\x04':
+            data.close()
+            return None
+
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        data.seek(old.header_offset + 30 + name_length + extra_length)
+
+        info.compress_type = compress_type
+        info.CRC, info.compress_size = old.CRC, old.compress_size
+        info.flag_bits |= old.flag_bits & 0x06  # compression options, e.g. the LZMA end-of-stream marker
+        return info, data
+
+    @staticmethod
+    def _compress_member(
+            path: str,
+            arcname: str,
+            compress_type: int,
+            block_size: int = 1024 * 1024,
+            spool_size: int = 16 * 1024 * 1024
+    ) -> "tuple[ZipInfo, SpooledTemporaryFile]":
+        """
+        Compress a file the way `ZipFile.write` does, into memory or a temporary file once above `spool_size`.
+
+        :return: The `ZipInfo` with CRC and sizes filled in and the compressed data positioned at its start.
+        """
+        info = ZipInfo.from_file(path, arcname)
+        info.compress_type = compress_type
+        compressor = _get_compressor(compress_type)
+        data = SpooledTemporaryFile(max_size=spool_size)
+        crc, size = 0, 0
+
+        with open(path, 'rb') as file:
+            while block := file.read(block_size):
+                crc = crc32(block, crc)
+                size += len(block)
+                data.write(compressor.compress(block) if compressor else block)
+
+        data.write(compressor.flush()) if compressor else None
+        info.CRC, info.file_size, info.compress_size = crc, size, data.tell()
+        if compress_type == ZIP_LZMA:
+            info.flag_bits |= 0x02  # compressed data includes an end-of-stream marker
+        data.seek(0)
+        return info, data
+
+    @staticmethod
+    def _can_write_compressed(archive: ZipFile) -> bool:
+        """
+        Check for the private `zipfile` internals used by `_compress_member` and `_write_compressed`.
+        """
+        return _get_compressor is not None and all(
+            hasattr(archive, name) for name in ('_lock', '_writecheck', '_didModify', 'fp', 'start_dir')
+        )
+
+    @staticmethod
+    def _write_compressed(archive: ZipFile, info: ZipInfo, data) -> None:
+        """
+        Append an already compressed member to an archive opened for writing, `info.compress_size` bytes
+        are copied from `data`. Mirrors `ZipFile.open(..., 'w')`, except that CRC and sizes are known
+        before the local header is written.
+        """
+        with data, archive._lock:
+            archive.fp.seek(archive.start_dir)
+            info.header_offset = archive.fp.tell()
+            archive._writecheck(info)
+            archive._didModify = True
+            archive.fp.write(info.FileHeader())
+
+            remaining = info.compress_size
+            while remaining:
+                block = data.read(min(remaining, 1024 * 1024))
+                if not block:
+                    raise EOFError(f"Compressed data of {info.filename} is truncated")
+                archive.fp.write(block)
+                remaining -= len(block)
+
+            archive.start_dir = archive.fp.tell()
+            archive.filelist.append(info)
+            archive.NameToInfo[info.filename] = info
+
     @staticmethod
     def get_archive_comment(archive_path: str, comment_encoding: str = 'utf-8') -> Optional[str]:
         """
@@ -328,55 +1530,289 @@ class File:
                 file.write('\n')
 
     @staticmethod
-    def unpacking(archive_path: str, execute_path: str, delete_archive: bool = False, stdout: bool = True) -> None:
+    def unpacking_url(
+            url: str,
+            execute_path: str,
+            archive_type: str = None,
+            include: "str | list | Callable[[str], bool]" = None,
+            process_bar: bool = True,
+            stdout: bool = True,
+            chunk_size: int = 1024 * 1024,
+            spool_size: int = 64 * 1024 * 1024,
+            session: Session = None
+    ) -> None:
+        """
+        Download an archive and unpack it without keeping the archive on disk.
+
+        Tar archives (plain, gz, bz2 and xz) are extracted from the HTTP stream while it is being downloaded.
+        The stream cannot seek back, so with `include` hardlinks to members that were not extracted are skipped.
+        Zip and 7z archives need random access to their central directory, so the body is buffered in a
+        `SpooledTemporaryFile` that stays in memory up to `spool_size` and is removed after extraction.
+        Zip archives with `include` are read with Range requests when the server supports them,
+        see `File.unpacking_remote_zip`.
+
+        :param url: Archive link.
+        :param execute_path: Directory to unpack into.
+        :param archive_type: (Optional) 'tar', 'zip' or '7z'. Defaults to detection by the URL extension, tar otherwise.
+        :param include: (Optional) Extract only matching members, see `File.unpacking_zip`.
+        :param process_bar: (Optional) Show download progress. Defaults to True.
+        :param stdout: (Optional) Print info messages. Defaults to True.
+        :param chunk_size: (Optional) Size of the chunks read from the response. Defaults to 1 MiB.
+        :param spool_size: (Optional) In-memory limit of the zip/7z buffer in bytes. Defaults to 64 MiB.
+        :param session: (Optional) A `requests.Session` to send the request through.
+        """
+        _name = basename(url.split('?')[0])
+        _type = archive_type or ('zip' if _name.endswith('.zip') else '7z' if _name.endswith('.7z') else 'tar')
+
+        if _type == 'zip' and include and File._accepts_ranges(File.get_headers(url, session=session)):
+            return File.unpacking_remote_zip(url, execute_path, include=include, stdout=stdout, session=session)
+
+        print(f'[green]|INFO| Unpacking from url via {_type}: {_name}') if stdout else None
+
+        Dir.create(execute_path, stdout=False)
+
+        with (session.get if session else get)(url, stream=True) as request, \
+                File._download_progress(process_bar) as progress:
+            request.raise_for_status()
+            length = request.headers.get('Content-Length', '')
+            task = progress.add_task(f'[red] Downloading: {_name}', total=int(length) if length.isdigit() else None)
+
+            if _type == 'tar':
+                with tarfile_open(fileobj=_ProgressReader(request, progress, task), mode='r|*') as archive:
+                    extracted = set()
+                    for member in archive:
+                        if include and not File._filter_members([member.name], include):
+                            continue
+                        if member.islnk() and member.linkname not in extracted:
+                            print(
+                                f'[red]|WARNING| Skipped hardlink to a member that is not extracted: '
+                                f'{member.name} -> {member.linkname}'
+                            ) if stdout else None
+                            continue
+                        archive.extract(member, execute_path, filter='data')
+                        extracted.add(member.name)
+            else:
+                with SpooledTemporaryFile(max_size=spool_size) as spool:
+                    File._write_response(request, spool, chunk_size, progress, task)
+                    spool.seek(0)
+
+                    if _type == 'zip':
+                        with ZipFile(spool) as archive:
+                            names = File._filter_members(archive.namelist(), include) if include else None
+                            archive.extractall(execute_path, members=names)
+                    else:
+                        with SevenZipFile(spool, 'r') as archive:
+                            if include:
+                                names = File._filter_members(archive.getnames(), include)
+                                archive.extract(path=execute_path, targets=names)
+                            else:
+                                archive.extractall(path=execute_path)
+
+        print(f'[green]|INFO| Unpack Completed to: {execute_path}') if stdout else None
+
+    @staticmethod
+    def open_remote_zip(url: str, session: Session = None, block_size: int = 1024 * 1024) -> ZipFile:
+        """
+        Open a remote zip archive without downloading it. The end of central directory record,
+        the central directory and the members that are read are fetched with HTTP Range requests.
+
+        :param url: Archive link, the server must support Range requests.
+        :param session: (Optional) A `requests.Session` to send the requests through.
+        :param block_size: (Optional) Minimal size of a single Range request in bytes. Defaults to 1 MiB.
+        :return: A `ZipFile` opened for reading.
+        """
+        headers = File.get_headers(url, session=session)
+        if not File._accepts_ranges(headers):
+            raise ValueError(f"Server does not support Range requests: {url}")
+
+        reader = HttpRangeReader(
+            url,
+            int(headers['Content-Length']),
+            session=session,
+            if_range=DownloadJournal.if_range(headers.get('ETag'), headers.get('Last-Modified'))
+        )
+        return ZipFile(BufferedReader(reader, buffer_size=block_size))
+
+    @staticmethod
+    def unpacking_remote_zip(
+            url: str,
+            execute_path: str,
+            include: "str | list | Callable[[str], bool]" = None,
+            stdout: bool = True,
+            session: Session = None,
+            block_size: int = 1024 * 1024
+    ) -> list[str]:
+        """
+        Extract members of a remote zip archive, fetching only the central directory and the selected members.
+
+        :param url: Archive link, the server must support Range requests.
+        :param execute_path: Directory to unpack into.
+        :param include: (Optional) Extract only matching members, see `File.unpacking_zip`. Defaults to all members.
+        :param stdout: (Optional) Print info messages. Defaults to True.
+        :param session: (Optional) A `requests.Session` to send the requests through.
+        :param block_size: (Optional) Minimal size of a single Range request in bytes. Defaults to 1 MiB.
+        :return: Names of the extracted members.
+        """
+        print(f'[green]|INFO| Unpacking remote zip: {url}') if stdout else None
+
+        with File.open_remote_zip(url, session=session, block_size=block_size) as archive:
+            names = File._filter_members(archive.namelist(), include) if include else archive.namelist()
+            archive.extractall(execute_path, members=names)
+            reader = archive.fp.raw
+
+        if stdout:
+            print(
+                f'[green]|INFO| Unpacked {len(names)} members to: {execute_path}, '
+                f'fetched {reader.fetched} of {reader.size} bytes in {reader.requests} requests'
+            )
+
+        return names
+
+    @staticmethod
+    def unpacking(
+            archive_path: str,
+            execute_path: str,
+            delete_archive: bool = False,
+            stdout: bool = True,
+            include: "str | list | Callable[[str], bool]" = None,
+            workers: int = None
+    ) -> None:
+        """
+        :param include: (Optional) Extract only matching members, see `File.unpacking_zip`.
+        :param workers: (Optional) Number of extraction threads, only used for zip archives.
+        """
         if archive_path.endswith('.7z'):
             File.unpacking_7z(
                 archive_path=archive_path,
                 execute_path=execute_path,
                 delete_archive=delete_archive,
-                stdout=stdout
+                stdout=stdout,
+                include=include
             )
         else:
             File.unpacking_zip(
                 archive_path=archive_path,
                 execute_path=execute_path,
                 delete_archive=delete_archive,
-                stdout=stdout
+                stdout=stdout,
+                include=include,
+                workers=workers
             )
 
     @staticmethod
-    def unpacking_7z(archive_path: str, execute_path: str, delete_archive: bool = False, stdout: bool = False) -> None:
+    def unpacking_7z(
+            archive_path: str,
+            execute_path: str,
+            delete_archive: bool = False,
+            stdout: bool = False,
+            include: "str | list | Callable[[str], bool]" = None
+    ) -> None:
+        """
+        :param include: (Optional) Extract only matching members, see `File.unpacking_zip`.
+        """
         print(f'[green]|INFO| Unpacking via SevenZip: {basename(archive_path)}.') if stdout else None
 
         with SevenZipFile(archive_path, 'r') as archive:
-            archive.extractall(path=execute_path)
+            if include:
+                archive.extract(path=execute_path, targets=File._filter_members(archive.getnames(), include))
+            else:
+                archive.extractall(path=execute_path)
 
         print(f'[green]|INFO| Unpack Completed to: {execute_path}') if stdout else None
         File.delete(archive_path, stdout=False) if delete_archive else ...
 
     @staticmethod
-    def unpacking_zip(archive_path: str, execute_path: str, delete_archive: bool = False, stdout: bool = False) -> None:
+    def unpacking_zip(
+            archive_path: str,
+            execute_path: str,
+            delete_archive: bool = False,
+            stdout: bool = False,
+            include: "str | list | Callable[[str], bool]" = None,
+            workers: int = None
+    ) -> None:
+        """
+        :param include: (Optional) Extract only matching members: a glob pattern matched against the member
+        name (e.g. 'sdk/include/*', `*` also matches '/'), a list of patterns, or a predicate called with the name.
+        :param workers: (Optional) Number of threads decompressing members in parallel. Directories are created
+        once before the files are extracted. Defaults to None (sequential `extractall`).
+        """
         print(f'[green]|INFO| Unpacking via ZipFile: {basename(archive_path)}.') if stdout else None
 
         with ZipFile(archive_path) as archive:
-            archive.extractall(execute_path)
+            names = File._filter_members(archive.namelist(), include) if include else None
+
+            if workers and workers > 1:
+                File._extract_parallel(archive, execute_path, names, workers)
+            else:
+                archive.extractall(execute_path, members=names)
 
         print(f'[green]|INFO| Unpack Completed to: {execute_path}') if stdout else None
         File.delete(archive_path, stdout=stdout) if delete_archive else ...
 
     @staticmethod
-    def make_tmp(file_path: str, tmp_dir: str = gettempdir()) -> str:
+    def _filter_members(names: list, include: "str | list | Callable[[str], bool]") -> list:
+        """
+        Select archive member names matching a glob pattern, a list of patterns or a predicate.
+        """
+        if callable(include):
+            return [name for name in names if include(name)]
+
+        patterns = [include] if isinstance(include, str) else include
+        return [name for name in names if any(fnmatchcase(name, pattern) for pattern in patterns)]
+
+    @staticmethod
+    def _extract_parallel(archive: ZipFile, execute_path: str, names: list = None, workers: int = 4) -> None:
+        """
+        Extract zip members on a thread pool, every thread reads through its own `ZipFile` handle.
+        """
+        infos = [archive.getinfo(name) for name in names] if names is not None else archive.infolist()
+
+        directories = {execute_path}
+        for info in infos:
+            parts = [part for part in info.filename.split('/') if part not in ('', '.', '..')]
+            directories.add(join(execute_path, *(parts if info.is_dir() else parts[:-1])))
+
+        for directory in sorted(directories):
+            makedirs(directory, exist_ok=True)
+
+        files = [info for info in infos if not info.is_dir()]
+        local = threading_local()
+        handles = []
+
+        def extract(info: ZipInfo) -> None:
+            if not hasattr(local, 'archive'):
+                local.archive = ZipFile(archive.filename)
+                handles.append(local.archive)
+            local.archive.extract(info, execute_path)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(extract, sorted(files, key=lambda info: info.file_size, reverse=True)):
+                    pass
+        finally:
+            for handle in handles:
+                handle.close()
+
+    @staticmethod
+    def make_tmp(file_path: str, tmp_dir: str = gettempdir(), link: str = None) -> str:
         """
         Create a temporary copy of a file.
 
         :param file_path: The path to the file to create a temporary copy of.
         :param tmp_dir: (Optional) The directory in which to create the temporary copy. Defaults to the system temporary directory.
-        :return: The path to the temporary copy of the file.
+        :param link: (Optional) 'reflink' or 'hardlink' to create the copy without copying data where possible,
+        falling back to a full copy. A reflink is an independent copy-on-write file, a hardlink shares the file
+        with the source and must only be read. Defaults to None: a full copy.
+        :return: The path to the temporary copy of the file, which has the permission bits of the source.
         """
-        Dir.create(tmp_dir, stdout=False) if not isdir(tmp_dir) else ...
-        tmp_file_path = File.unique_name(tmp_dir, file_path.split(".")[-1])
         if exists(file_path):
-            File.copy(file_path, tmp_file_path, stdout=False)
+            file, tmp_file_path = File.create_tmp(tmp_dir, file_path.split(".")[-1])
+            file.close()
+            if link:
+                File._materialize(file_path, tmp_file_path, (link, 'copy'))
+            else:
+                File.copy(file_path, tmp_file_path, stdout=False)
+            copymode(file_path, tmp_file_path)
             return tmp_file_path
         print(f"[red]|ERROR| Can't create tmp file.\nThe source file does not exist: {file_path}")
 
@@ -384,6 +1820,7 @@ class File:
     def unique_name(path: str, extension: str = None) -> str:
         """
         Generate a unique filename in a given directory.
+        The name is 32 random hex characters, use `File.create_tmp` to reserve a name atomically.
 
         :param path: The directory path in which to generate the unique filename.
         :param extension: (Optional) The extension for the filename. If provided, it should not contain a leading period.
@@ -391,10 +1828,46 @@ class File:
         """
         _ext = extension.replace(".", "") if extension else None
         while True:
-            random_path = join(path, f"{randint(500, 50000)}{('.' + _ext) if _ext else ''}".strip())
+            random_path = join(path, f"{token_hex(16)}{('.' + _ext) if _ext else ''}")
             if not exists(random_path):
                 return random_path
 
+    @staticmethod
+    def create_tmp(tmp_dir: str = gettempdir(), extension: str = None, prefix: str = '') -> tuple[BinaryIO, str]:
+        """
+        Atomically create a new empty file with a random name, opened for reading and writing.
+        The file is created by `tempfile.mkstemp` with 0o600 permissions, so concurrent callers never receive
+        the same path. The caller is responsible for closing and removing it.
+
+        :param tmp_dir: (Optional) The directory to create the file in, created if missing.
+        Defaults to the system temporary directory.
+        :param extension: (Optional) The extension for the filename, without a leading period.
+        :param prefix: (Optional) A prefix for the filename.
+        :return: The open binary file object and its path.
+        """
+        makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = mkstemp(suffix=f".{extension.lstrip('.')}" if extension else '', prefix=prefix, dir=tmp_dir)
+        return fdopen(fd, 'w+b'), tmp_path
+
+    @staticmethod
+    @contextmanager
+    def tmp_workspace(tmp_dir: str = gettempdir(), prefix: str = 'host_tools_', workers: int = None) -> Iterator[str]:
+        """
+        Context manager creating a private temporary directory that is deleted with all its content on exit,
+        including when an exception is raised.
+
+        :param tmp_dir: (Optional) The parent directory, created if missing. Defaults to the system temporary directory.
+        :param prefix: (Optional) A prefix for the directory name. Defaults to 'host_tools_'.
+        :param workers: (Optional) Number of threads deleting the workspace, see `Dir.remove_tree`. Defaults to None.
+        :return: The path of the workspace.
+        """
+        makedirs(tmp_dir, exist_ok=True)
+        workspace = mkdtemp(prefix=prefix, dir=tmp_dir)
+        try:
+            yield workspace
+        finally:
+            Dir.remove_tree(workspace, workers=workers, full_access=True) if isdir(workspace) else None
+
     @staticmethod
     def last_modified(dir_path: str) -> str:
         """
@@ -404,8 +1877,66 @@ class File:
         :return: The path of the last modified file in the directory.
         If no files are found in the directory, prints a warning message.
         """
-        files = File.get_paths(dir_path, exceptions_files=File.EXCEPTIONS)
-        return max(files, key=getctime) if files else print('[red]|WARNING| Last modified file not found')
+        paths = File.most_recent(dir_path, time='ctime', exceptions_files=File.EXCEPTIONS)
+        return paths[0] if paths else print('[red]|WARNING| Last modified file not found')
+
+    @staticmethod
+    def most_recent(
+            path: str,
+            count: int = 1,
+            time: str = 'mtime',
+            extension: "tuple | str" = None,
+            names: list = None,
+            exceptions_files: list = None,
+            exceptions_dirs: list = None,
+            path_include: str = None,
+            dir_include: str = None,
+            name_include: str = None,
+            name_starts_with: str = None,
+            workers: int = None
+    ) -> list[str]:
+        """
+        Find the most recently changed files in a directory tree in a single pass.
+        Timestamps are read from the `os.DirEntry` of the walk and only the newest `count` files are kept in a heap.
+
+        :param path: The directory to search in.
+        :param count: (Optional) Number of files to return. Defaults to 1.
+        :param time: (Optional) 'mtime' or 'ctime', the timestamp to order files by. Defaults to 'mtime'.
+        :param extension: (Optional) Only include files with this extension or tuple of extensions.
+        :param names: (Optional) Only include files with these names.
+        :param exceptions_files: (Optional) File names to exclude.
+        :param exceptions_dirs: (Optional) Directory names to exclude.
+        :param path_include: (Optional) Only include files whose directory path contains this substring.
+        :param dir_include: (Optional) Only include files whose directory name contains this substring.
+        :param name_include: (Optional) Only include files whose names contain this substring.
+        :param name_starts_with: (Optional) Only include files whose names start with this substring.
+        :param workers: (Optional) Number of threads scanning directories in parallel, see `Dir.scan`. Defaults to None.
+        :return: Paths of the newest files, newest first.
+        """
+        if time not in ('mtime', 'ctime'):
+            raise ValueError(f"Unsupported time: {time}, expected 'mtime' or 'ctime'")
+
+        attribute = f"st_{time}_ns"
+
+        def timestamps() -> Iterator[tuple[int, str]]:
+            for entry in File.iter_paths(
+                    path,
+                    extension=extension,
+                    names=names,
+                    exceptions_files=exceptions_files,
+                    exceptions_dirs=exceptions_dirs,
+                    path_include=path_include,
+                    dir_include=dir_include,
+                    name_include=name_include,
+                    name_starts_with=name_starts_with,
+                    workers=workers
+            ):
+                try:
+                    yield getattr(entry.stat(), attribute), entry.path
+                except OSError:
+                    continue
+
+        return [entry_path for _, entry_path in heapq.nlargest(count, timestamps())]
 
     @staticmethod
     def copy(
@@ -421,7 +1952,7 @@ class File:
         if isdir(path_from):
             Dir.copy(path_from, path_to, stdout=stdout, stderr=stderr, overwrite=dir_overwrite)
         else:
-            copyfile(path_from, path_to)
+            File._copy_data(path_from, path_to)
 
         if exists(path_to):
             return print(f'[green]|INFO| Copied to: {path_to}') if stdout else None
@@ -458,7 +1989,9 @@ class File:
             path_include: str = None,
             dir_include: str = None,
             name_include: str = None,
-            name_starts_with: str = None
+            name_starts_with: str = None,
+            workers: int = None,
+            sort: bool = False
     ) -> list:
         """
         Retrieve file paths under a given directory based on specified criteria.
@@ -472,44 +2005,104 @@ class File:
         :param dir_include: (Optional) Only include directories containing this substring in their name. Defaults to None.
         :param name_include: (Optional) Only include files containing this substring in their name. Defaults to None.
         :param name_starts_with: (Optional) Only include files whose names start with this substring. Defaults to None.
+        :param workers: (Optional) Number of threads scanning directories in parallel, see `Dir.scan`. Defaults to None.
+        :param sort: (Optional) Return the paths sorted, parallel scans otherwise return them in completion order.
 
         :return: A list of file paths matching the specified criteria.
         """
+        paths = [
+            entry.path for entry in File.iter_paths(
+                path,
+                extension=extension,
+                names=names,
+                exceptions_files=exceptions_files,
+                exceptions_dirs=exceptions_dirs,
+                path_include=path_include,
+                dir_include=dir_include,
+                name_include=name_include,
+                name_starts_with=name_starts_with,
+                workers=workers
+            )
+        ]
+        return sorted(paths) if sort else paths
 
-        if exceptions_dirs:
-            exceptions_dirs = {join(path, dir_name) for dir_name in (exceptions_dirs or set())}
-
-        if extension:
-            extension = tuple(ext.lower() for ext in extension) if isinstance(extension, tuple) else extension.lower()
+    @staticmethod
+    def iter_paths(
+            path: str,
+            extension: "tuple | str" = None,
+            names: list = None,
+            exceptions_files: list = None,
+            exceptions_dirs: list = None,
+            path_include: str = None,
+            dir_include: str = None,
+            name_include: str = None,
+            name_starts_with: str = None,
+            workers: int = None
+    ) -> Iterator[DirEntry]:
+        """
+        Lazily walk a directory with `os.scandir` and yield the `os.DirEntry` of every matching file,
+        in the same order and with the same filters as `File.get_paths`.
+        Excluded directories are never descended into. `DirEntry.stat()` caches its result per entry
+        and needs no system call on Windows.
+
+        :param workers: (Optional) Number of threads scanning directories in parallel, see `Dir.scan`.
+        Files are then yielded in completion order. Defaults to None.
+        :return: An iterator of `os.DirEntry` objects of the matching files.
+        """
+        excluded_dirs = [join(path, dir_name) for dir_name in exceptions_dirs] if exceptions_dirs else None
+        dir_check = File._dir_filter(path_include, dir_include)
+        name_check = File._name_filter(extension, names, exceptions_files, name_include, name_starts_with)
+        skip_dir = (lambda entry: any(excluded in entry.path for excluded in excluded_dirs)) if excluded_dirs else None
 
-        file_paths = []
+        for root, _, files in Dir.scan(path, workers=workers, skip_dir=skip_dir):
+            if dir_check(root):
+                for entry in files:
+                    if name_check(entry.name):
+                        yield entry
 
-        for root, dirs, files in walk(path):
-            if exceptions_dirs and any(ext_path in root for ext_path in exceptions_dirs):
-                continue
+    @staticmethod
+    def _dir_filter(path_include: str = None, dir_include: str = None) -> Callable[[str], bool]:
+        """
+        Build the directory check of `File.iter_paths` once, deciding whether files of a directory are listed.
+        """
+        if not path_include and not dir_include:
+            return lambda root: True
 
-            if dir_include and dir_include not in basename(root):
-                continue
+        return lambda root: (not dir_include or dir_include in basename(root)) \
+            and (not path_include or path_include in root)
 
-            if path_include and path_include not in root:
-                continue
+    @staticmethod
+    def _name_filter(
+            extension: "tuple | str" = None,
+            names: list = None,
+            exceptions_files: list = None,
+            name_include: str = None,
+            name_starts_with: str = None
+    ) -> Callable[[str], bool]:
+        """
+        Build the file name check of `File.iter_paths` once, with only the filters that are set.
+        """
+        checks = []
 
-            for filename in files:
-                if exceptions_files and filename in exceptions_files:
-                    continue
+        if exceptions_files:
+            _exceptions = set(exceptions_files)
+            checks.append(lambda name: name not in _exceptions)
 
-                if name_include and name_include not in filename:
-                    continue
+        if name_include:
+            checks.append(lambda name: name_include in name)
 
-                if name_starts_with and not filename.startswith(name_starts_with):
-                    continue
+        if name_starts_with:
+            checks.append(lambda name: name.startswith(name_starts_with))
 
-                if names and filename not in names:
-                    continue
+        if names:
+            _names = set(names)
+            checks.append(lambda name: name in _names)
 
-                if extension and not filename.lower().endswith(extension):
-                    continue
+        if extension:
+            _extension = tuple(ext.lower() for ext in extension) if isinstance(extension, tuple) else extension.lower()
+            checks.append(lambda name: name.lower().endswith(_extension))
 
-                file_paths.append(join(root, filename))
+        if not checks:
+            return lambda name: True
 
-        return file_paths
+        return lambda name: all(check(name) for check in checks)
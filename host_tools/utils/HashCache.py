@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import sqlite3
+
+from os import makedirs, stat, stat_result
+from os.path import abspath, dirname
+from threading import Lock
+from typing import Optional
+
+
+class HashCache:
+    """
+    Persistent SQLite cache of file digests for `File.get_hash` and the bulk hashing helpers.
+
+    Entries are keyed by (device, inode, size, mtime_ns), so unchanged files are answered without reading them
+    and any write, truncation or replacement of a file invalidates its entry.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        :param db_path: Path to the SQLite database, created if it does not exist.
+        """
+        makedirs(dirname(abspath(db_path)), exist_ok=True)
+
+        self.db_path = db_path
+        self._lock = Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS hashes ('
+            'device INTEGER, inode INTEGER, algorithm TEXT, size INTEGER, mtime_ns INTEGER, path TEXT, digest TEXT, '
+            'PRIMARY KEY (device, inode, algorithm))'
+        )
+        self._connection.commit()
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get(self, path: str, algorithm: str = 'sha256') -> Optional[str]:
+        """
+        :return: The cached hex digest of `path` if the file is unchanged since it was hashed, otherwise None.
+        """
+        _stat = stat(path)
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT digest, path FROM hashes '
+                'WHERE device = ? AND inode = ? AND algorithm = ? AND size = ? AND mtime_ns = ?',
+                (_stat.st_dev, _stat.st_ino, algorithm, _stat.st_size, _stat.st_mtime_ns)
+            ).fetchone()
+
+            if row and row[1] != abspath(path):
+                self._connection.execute(
+                    'UPDATE hashes SET path = ? WHERE device = ? AND inode = ? AND algorithm = ?',
+                    (abspath(path), _stat.st_dev, _stat.st_ino, algorithm)
+                )
+                self._connection.commit()
+
+        return row[0] if row else None
+
+    def set(self, path: str, algorithm: str, digest: str, hashed_stat: stat_result) -> bool:
+        """
+        Store the digest of `path`.
+
+        :param hashed_stat: `os.stat` result taken before the file was hashed. The entry is only stored
+        if the file still has the same identity, size and mtime, so a file modified during hashing is not cached.
+        :return: True if the digest was stored.
+        """
+        _stat = stat(path)
+        key = (_stat.st_dev, _stat.st_ino, _stat.st_size, _stat.st_mtime_ns)
+        if key != (hashed_stat.st_dev, hashed_stat.st_ino, hashed_stat.st_size, hashed_stat.st_mtime_ns):
+            return False
+
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO hashes (device, inode, algorithm, size, mtime_ns, path, digest) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (_stat.st_dev, _stat.st_ino, algorithm, _stat.st_size, _stat.st_mtime_ns, abspath(path), digest)
+            )
+            self._connection.commit()
+
+        return True
+
+    def prune(self) -> int:
+        """
+        Remove entries of files that no longer exist or have changed since they were hashed.
+
+        :return: The number of removed entries.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT device, inode, algorithm, size, mtime_ns, path FROM hashes'
+            ).fetchall()
+
+            stale = []
+            for device, inode, algorithm, size, mtime_ns, path in rows:
+                try:
+                    _stat = stat(path)
+                except OSError:
+                    stale.append((device, inode, algorithm))
+                    continue
+
+                if (_stat.st_dev, _stat.st_ino, _stat.st_size, _stat.st_mtime_ns) != (device, inode, size, mtime_ns):
+                    stale.append((device, inode, algorithm))
+
+            self._connection.executemany(
+                'DELETE FROM hashes WHERE device = ? AND inode = ? AND algorithm = ?', stale
+            )
+            self._connection.commit()
+
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM hashes')
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM hashes').fetchone()[0]
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+from io import RawIOBase, SEEK_SET, SEEK_CUR, SEEK_END
+
+from requests import get, Session
+
+
+class HttpRangeReader(RawIOBase):
+    """
+    Seekable read-only file object over a remote file, every read is served by one HTTP Range request.
+    Wrap it in `io.BufferedReader` to fetch larger blocks and serve small reads from memory.
+    """
+
+    def __init__(self, url: str, size: int, session: Session = None, if_range: str = None):
+        """
+        :param url: URL of the remote file.
+        :param size: Size of the remote file in bytes, e.g. the `Content-Length` from `File.get_headers`.
+        :param session: (Optional) A `requests.Session` to send the requests through.
+        :param if_range: (Optional) Strong `ETag` or `Last-Modified` value of the file, reads fail with OSError
+        if the remote file has changed. Servers ignore Ranges sent with a weak `W/` ETag.
+        """
+        super().__init__()
+        self.url = url
+        self.size = size
+        self.requests = 0
+        self.fetched = 0
+        self._session = session
+        self._if_range = if_range
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if whence == SEEK_SET:
+            position = offset
+        elif whence == SEEK_CUR:
+            position = self._position + offset
+        elif whence == SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if position < 0:
+            raise OSError(f"Negative seek position: {position}")
+
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        if self._position >= self.size or len(buffer) == 0:
+            return 0
+
+        end = min(self._position + len(buffer), self.size) - 1
+        headers = {'Range': f'bytes={self._position}-{end}'}
+        if self._if_range:
+            headers['If-Range'] = self._if_range
+
+        with (self._session.get if self._session else get)(self.url, headers=headers) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise OSError(f"Server ignored Range request, status: {response.status_code}, url: {self.url}")
+            data = response.content[:end - self._position + 1]
+
+        buffer[:len(data)] = data
+        self._position += len(data)
+        self.requests += 1
+        self.fetched += len(data)
+        return len(data)
@@ -1,5 +1,13 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import psutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+from contextlib import ExitStack
+from threading import Thread, Lock, Event
+from time import monotonic
+from typing import Callable, Optional, TextIO
 from subprocess import (
     Popen,
     PIPE,
@@ -22,7 +30,13 @@ def run(
         shell: bool = True,
         stdout: bool = True,
         stderr: bool = True,
-        kill_children_processes: bool = False
+        kill_children_processes: bool = False,
+        stream: bool = False,
+        on_stdout: Callable[[str], None] = None,
+        on_stderr: Callable[[str], None] = None,
+        tee_stdout: str = None,
+        tee_stderr: str = None,
+        max_lines: int = None
     ) -> CompletedProcess:
     """
     Run a shell command and return a `CompletedProcess` object.
@@ -33,8 +47,23 @@ def run(
     :param stdout: (Optional) If True, prints the standard output of the command. Defaults to True.
     :param stderr: (Optional) If True, prints the standard error of the command. Defaults to True.
     :param kill_children_processes: (Optional) If True, kill any child processes spawned by the command if it times out. Defaults to False.
+    :param stream: (Optional) Read stdout and stderr line by line while the command runs instead of after it exits.
+    Lines are printed as they arrive, passed to the callbacks and written to the tee files.
+    Implied by any of the following parameters. Defaults to False.
+    :param on_stdout: (Optional) Called with every line of the standard output, without the line break.
+    :param on_stderr: (Optional) Called with every line of the standard error, without the line break.
+    :param tee_stdout: (Optional) Path to a file receiving the complete standard output.
+    :param tee_stderr: (Optional) Path to a file receiving the complete standard error, may be the same as `tee_stdout`.
+    :param max_lines: (Optional) Keep only the last `max_lines` lines of each stream in the result,
+    so commands with huge outputs run in bounded memory. Defaults to None: keep everything.
     :return: A `CompletedProcess` object representing the result of the command execution.
     """
+    if stream or on_stdout or on_stderr or tee_stdout or tee_stderr or max_lines:
+        return _run_streaming(
+            command, timeout, shell, stdout, stderr, kill_children_processes,
+            on_stdout, on_stderr, tee_stdout, tee_stderr, max_lines
+        )
+
     with Popen(
         command if shell else command.split(),
         stdout=PIPE,
@@ -47,14 +76,7 @@ def run(
             completed_process = CompletedProcess(process.args, process.returncode, _stdout.strip(), _stderr.strip())
 
         except TimeoutExpired:
-            children_processes = psutil.Process(process.pid).children(recursive=True) if kill_children_processes else None
-            process.kill()
-
-            if children_processes:
-                for _process in children_processes:
-                    print(f"Killed children process: {_process.name()}, pid: {_process.pid}") if stdout else None
-                    psutil.Process(_process.pid).kill()
-
+            _kill(process, kill_children_processes, stdout)
             completed_process = CompletedProcess(
                 process.args,
                 1,
@@ -67,3 +89,220 @@ def run(
             print(completed_process.stdout) if stdout and completed_process.stdout else None
 
     return completed_process
+
+def run_many(
+        commands: list,
+        workers: int = None,
+        timeout: int = None,
+        shell: bool = True,
+        stdout: bool = True,
+        stderr: bool = True,
+        kill_children_processes: bool = False
+) -> list[CompletedProcess]:
+    """
+    Run several commands concurrently, see `run_many_async`.
+    Can also be called while an event loop is running, the commands then run on a separate thread.
+
+    :return: `CompletedProcess` objects in the order of `commands`.
+    """
+    coroutine = run_many_async(commands, workers, timeout, shell, stdout, stderr, kill_children_processes)
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+async def run_many_async(
+        commands: list,
+        workers: int = None,
+        timeout: int = None,
+        shell: bool = True,
+        stdout: bool = True,
+        stderr: bool = True,
+        kill_children_processes: bool = False
+) -> list[CompletedProcess]:
+    """
+    Run several commands concurrently with asyncio subprocesses, at most `workers` at a time.
+
+    :param commands: The commands to run.
+    :param workers: (Optional) Maximum number of commands running at the same time. Defaults to the number of CPUs.
+    :param timeout: (Optional) The maximum time to wait for each command to finish (in seconds). Defaults to None.
+    :param shell: (Optional) If True, the commands will be executed through the shell. Defaults to True.
+    :param stdout: (Optional) If True, prints the standard output of every command when it finishes. Defaults to True.
+    :param stderr: (Optional) If True, prints the standard error of every command when it finishes. Defaults to True.
+    :param kill_children_processes: (Optional) If True, kill any child processes spawned by a command if it times out. Defaults to False.
+    :return: `CompletedProcess` objects in the order of `commands`, a timed out command gets return code 1 like in `run`.
+    """
+    semaphore = asyncio.Semaphore(workers or cpu_count() or 1)
+
+    async def run_one(command: str) -> CompletedProcess:
+        async with semaphore:
+            if shell:
+                process = await asyncio.create_subprocess_shell(command, stdout=PIPE, stderr=PIPE)
+            else:
+                process = await asyncio.create_subprocess_exec(*command.split(), stdout=PIPE, stderr=PIPE)
+
+            try:
+                _stdout, _stderr = await asyncio.wait_for(process.communicate(), timeout)
+                completed_process = CompletedProcess(
+                    command if shell else command.split(),
+                    process.returncode,
+                    _stdout.decode(errors='replace').strip(),
+                    _stderr.decode(errors='replace').strip()
+                )
+
+            except asyncio.TimeoutError:
+                _kill(process, kill_children_processes, stdout)
+                if _close_pipes(process):
+                    await process.wait()
+                else:
+                    try:
+                        await asyncio.wait_for(process.wait(), 1)
+                    except asyncio.TimeoutError:
+                        pass
+                completed_process = CompletedProcess(
+                    command if shell else command.split(),
+                    1,
+                    '',
+                    f"timeout expired when executing the command: {command}"
+                )
+
+            print(completed_process.stderr) if stderr and completed_process.stderr else None
+            print(completed_process.stdout) if stdout and completed_process.stdout else None
+            return completed_process
+
+    return list(await asyncio.gather(*(run_one(command) for command in commands)))
+
+def _close_pipes(process: asyncio.subprocess.Process) -> bool:
+    """
+    Close the stdout and stderr pipes of an asyncio subprocess, `Process.wait` also waits for them to close,
+    which a grandchild holding them open would delay. Relies on the private `_transport` attribute,
+    verified on CPython 3.11 and 3.12.
+
+    :return: False if the pipes could not be reached.
+    """
+    get_pipe_transport = getattr(getattr(process, '_transport', None), 'get_pipe_transport', None)
+    if get_pipe_transport is None:
+        return False
+
+    for fd in (1, 2):
+        pipe = get_pipe_transport(fd)
+        pipe.close() if pipe else None
+    return True
+
+def _run_streaming(
+        command: str,
+        timeout: Optional[int],
+        shell: bool,
+        stdout: bool,
+        stderr: bool,
+        kill_children_processes: bool,
+        on_stdout: Optional[Callable[[str], None]],
+        on_stderr: Optional[Callable[[str], None]],
+        tee_stdout: Optional[str],
+        tee_stderr: Optional[str],
+        max_lines: Optional[int]
+) -> CompletedProcess:
+    """
+    `run` reading both pipes on their own threads, so neither can fill up and block the command.
+    """
+    with ExitStack() as stack:
+        tees = {}
+        for path in {tee_stdout, tee_stderr} - {None}:
+            tees[path] = (stack.enter_context(open(path, 'w', encoding='utf-8')), Lock())
+
+        process = stack.enter_context(Popen(
+            command if shell else command.split(),
+            stdout=PIPE,
+            stderr=PIPE,
+            text=True,
+            errors='replace',
+            shell=shell
+        ))
+
+        buffers = {'stdout': deque(maxlen=max_lines), 'stderr': deque(maxlen=max_lines)}
+        stopped = Event()
+        readers = [
+            Thread(
+                target=_read_lines,
+                args=(process.stdout, buffers['stdout'], on_stdout, tees.get(tee_stdout), stdout, stopped),
+                daemon=True
+            ),
+            Thread(
+                target=_read_lines,
+                args=(process.stderr, buffers['stderr'], on_stderr, tees.get(tee_stderr), stderr, stopped),
+                daemon=True
+            )
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            returncode = process.wait(timeout=timeout)
+            for reader in readers:
+                reader.join()
+            completed_process = CompletedProcess(
+                process.args, returncode, '\n'.join(buffers['stdout']).strip(), '\n'.join(buffers['stderr']).strip()
+            )
+
+        except TimeoutExpired:
+            _kill(process, kill_children_processes, stdout)
+            process.wait()
+            deadline = monotonic() + 1
+            for reader in readers:
+                reader.join(timeout=max(deadline - monotonic(), 0))
+
+            if any(reader.is_alive() for reader in readers):
+                # A surviving grandchild keeps the pipes open: closing them would block on the readers,
+                # so leave them to the readers and stop them before the tee files are closed.
+                for _, lock in tees.values():
+                    lock.acquire()
+                stopped.set()
+                for _, lock in tees.values():
+                    lock.release()
+                process.stdout = process.stderr = None
+
+            completed_process = CompletedProcess(
+                process.args,
+                1,
+                '\n'.join(buffers['stdout']).strip(),
+                f"timeout expired when executing the command: {command}"
+            )
+            print(completed_process.stderr) if stderr else None
+
+    return completed_process
+
+def _read_lines(
+        pipe: TextIO,
+        buffer: deque,
+        callback: Optional[Callable[[str], None]],
+        tee: Optional[tuple[TextIO, Lock]],
+        echo: bool,
+        stopped: Event
+) -> None:
+    with pipe:
+        for line in iter(pipe.readline, ''):
+            if tee:
+                with tee[1]:
+                    if stopped.is_set():
+                        return
+                    tee[0].write(line)
+            elif stopped.is_set():
+                return
+
+            line = line.rstrip('\r\n')
+            buffer.append(line)
+            print(line) if echo else None
+            callback(line) if callback else None
+
+def _kill(process: "Popen | asyncio.subprocess.Process", kill_children_processes: bool = False, stdout: bool = True) -> None:
+    children_processes = psutil.Process(process.pid).children(recursive=True) if kill_children_processes else None
+    process.kill()
+
+    if children_processes:
+        for _process in children_processes:
+            print(f"Killed children process: {_process.name()}, pid: {_process.pid}") if stdout else None
+            psutil.Process(_process.pid).kill()
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SyncResult:
+    """
+    Outcome of `Dir.sync`, paths are relative to the synced directories.
+
+    :param copied: Files that did not exist in the destination.
+    :param updated: Files that differed and were overwritten.
+    :param deleted: Extraneous files and directories removed from the destination.
+    :param unchanged: Number of files that were already up to date.
+    :param size: Number of bytes copied.
+    :param duration: Wall-clock duration of the sync in seconds.
+    :param errors: (path, error message) pairs of files that could not be synced.
+    """
+    copied: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    deleted: list = field(default_factory=list)
+    unchanged: int = 0
+    size: int = 0
+    duration: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
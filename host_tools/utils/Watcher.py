@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+import ctypes
+import struct
+
+from ctypes.util import find_library
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from os import read, close, fsencode, fsdecode, stat, sep
+from os.path import join, normpath, relpath, basename
+from select import select
+from time import monotonic, sleep
+from typing import Optional, Iterator
+
+from host_tools.utils import Dir
+
+try:
+    _libc = ctypes.CDLL(find_library('c') or 'libc.so.6', use_errno=True)
+    _libc.inotify_init1, _libc.inotify_add_watch, _libc.inotify_rm_watch
+except (OSError, AttributeError):
+    _libc = None
+
+
+@dataclass
+class WatchEvent:
+    """
+    A change in a watched tree.
+
+    :param type: 'create', 'modify', 'delete', 'close_write' (a file opened for writing was closed,
+    only reported by the inotify backend) or 'rescan' (the inotify queue overflowed and events were lost,
+    `path` is the watched directory and its contents should be scanned again).
+    :param path: Path of the changed file or directory.
+    :param is_dir: True if the path is a directory.
+    """
+    type: str
+    path: str
+    is_dir: bool = False
+
+
+class Watcher:
+    """
+    Watch a directory tree for changes, with inotify on Linux and periodic scanning elsewhere.
+
+    The watch is established when the object is created, so nothing that happens afterwards is missed.
+    Use it as a context manager or call `close` to release the inotify descriptor.
+    """
+    IN_MODIFY = 0x2
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_MOVE_SELF = 0x800
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MOVE_SELF
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, path: str, recursive: bool = True, poll_interval: float = 0.5, backend: str = 'auto'):
+        """
+        :param path: The directory to watch.
+        :param recursive: (Optional) Also watch subdirectories, including ones created later. Defaults to True.
+        :param poll_interval: (Optional) Seconds between scans of the polling backend. Defaults to 0.5.
+        :param backend: (Optional) 'inotify', 'poll' or 'auto' to use inotify where it is available. Defaults to 'auto'.
+        """
+        self.path = normpath(path)
+        self.recursive = recursive
+        self.poll_interval = poll_interval
+        self._fd = None
+        self._watches: dict[int, str] = {}
+
+        if backend == 'inotify' and _libc is None:
+            raise OSError("inotify is not available on this system")
+
+        self.backend = 'inotify' if backend in ('auto', 'inotify') and _libc is not None else 'poll'
+
+        if self.backend == 'inotify':
+            self._fd = _libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+            if self._fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            self._watch_tree(self.path)
+        else:
+            self._state = self._scan()
+            self._polled_at = monotonic()
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[WatchEvent]:
+        while True:
+            yield from self.read()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            close(self._fd)
+            self._fd = None
+
+    def read(self, timeout: float = None) -> list[WatchEvent]:
+        """
+        Wait for changes.
+
+        :param timeout: (Optional) Maximum number of seconds to wait, None waits until something changes.
+        :return: The events that occurred, an empty list if the timeout expired.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else max(deadline - monotonic(), 0)
+            events = self._read_inotify(remaining) if self.backend == 'inotify' else self._read_poll(remaining)
+            if events or (deadline is not None and monotonic() >= deadline):
+                return events
+
+    def wait_for(self, pattern: str, timeout: float = None, quiet: float = None) -> Optional[str]:
+        """
+        Wait until a file matching `pattern` exists.
+
+        :param pattern: fnmatch pattern matched against file names and paths relative to the watched directory.
+        :param timeout: (Optional) Maximum number of seconds to wait. Defaults to None: wait forever.
+        :param quiet: (Optional) Also wait until the file has stopped changing for this many seconds,
+        see `wait_stable`. Defaults to None.
+        :return: Path of the matching file, or None if the timeout expired.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        found = self._find(pattern)
+
+        while not found:
+            remaining = None if deadline is None else deadline - monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+
+            for event in self.read(remaining):
+                if event.type == 'rescan':
+                    found = self._find(pattern)
+                elif event.type != 'delete' and not event.is_dir and self._matches(event.path, pattern):
+                    found = event.path
+                if found:
+                    break
+
+        if quiet is not None:
+            remaining = None if deadline is None else max(deadline - monotonic(), 0)
+            if not self.wait_stable(found, quiet=quiet, timeout=remaining):
+                return None
+
+        return found
+
+    def wait_stable(self, path: str, quiet: float = 1.0, timeout: float = None) -> bool:
+        """
+        Wait until a file exists and has neither been written nor changed its size or mtime for `quiet` seconds.
+
+        :param path: Path of the file inside the watched directory.
+        :param quiet: (Optional) Number of seconds without changes. Defaults to 1.0.
+        :param timeout: (Optional) Maximum number of seconds to wait. Defaults to None: wait forever.
+        :return: True if the file is stable, False if the timeout expired.
+        """
+        path = normpath(path)
+        deadline = None if timeout is None else monotonic() + timeout
+        last, quiet_since = self._stat(path), monotonic()
+
+        while True:
+            now = monotonic()
+            if last is not None and now - quiet_since >= quiet:
+                return True
+            if deadline is not None and now >= deadline:
+                return False
+
+            wait = quiet - (now - quiet_since) if last is not None else quiet
+            events = self.read(wait if deadline is None else min(wait, deadline - now))
+
+            current = self._stat(path)
+            if current != last or any(event.path == path for event in events):
+                last, quiet_since = current, monotonic()
+
+    def _find(self, pattern: str) -> Optional[str]:
+        for root, _, files in Dir.scan(self.path, skip_dir=None if self.recursive else lambda entry: True):
+            for entry in files:
+                if self._matches(entry.path, pattern):
+                    return normpath(entry.path)
+        return None
+
+    def _matches(self, path: str, pattern: str) -> bool:
+        return fnmatchcase(basename(path), pattern) or fnmatchcase(relpath(path, self.path).replace('\\', '/'), pattern)
+
+    @staticmethod
+    def _stat(path: str) -> Optional[tuple]:
+        try:
+            _stat = stat(path)
+        except OSError:
+            return None
+        return _stat.st_size, _stat.st_mtime_ns
+
+    def _watch_tree(self, path: str, report: bool = False) -> list[WatchEvent]:
+        """
+        Add watches for `path` and, if recursive, its subdirectories.
+
+        :param report: Return create events for the entries found inside `path`, which may have appeared
+        before their directory was watched.
+        """
+        events = []
+        for root, dirs, files in Dir.scan(path, skip_dir=None if self.recursive else lambda entry: True):
+            wd = _libc.inotify_add_watch(self._fd, fsencode(root), self.WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = root
+            if report:
+                events.extend(WatchEvent('create', normpath(entry.path)) for entry in files)
+                events.extend(WatchEvent('create', normpath(entry.path), True) for entry in dirs)
+        return events
+
+    def _unwatch_tree(self, path: str) -> None:
+        """
+        Remove the watches of `path` and of every directory below it, after it was moved away.
+        """
+        for wd, root in list(self._watches.items()):
+            if root == path or root.startswith(path + sep):
+                _libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def _read_inotify(self, timeout: float = None) -> list[WatchEvent]:
+        if not select([self._fd], [], [], timeout)[0]:
+            return []
+
+        try:
+            data = read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events, offset = [], 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            name = fsdecode(data[offset + self.EVENT_HEADER.size:offset + self.EVENT_HEADER.size + length].rstrip(b'\0'))
+            offset += self.EVENT_HEADER.size + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                self._unwatch_tree(self.path)
+                self._watch_tree(self.path)
+                events.append(WatchEvent('rescan', self.path, True))
+                continue
+
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            if mask & self.IN_MOVE_SELF and wd in self._watches:
+                # A moved subdirectory is already unwatched through the IN_MOVED_FROM of its parent
+                path = self._watches[wd]
+                self._unwatch_tree(path)
+                events.append(WatchEvent('delete', path, True)) if path == self.path else None
+                continue
+
+            if wd not in self._watches or not name:
+                continue
+
+            path, is_dir = join(self._watches[wd], name), bool(mask & self.IN_ISDIR)
+
+            if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                events.append(WatchEvent('create', path, is_dir))
+                if is_dir and self.recursive:
+                    events.extend(self._watch_tree(path, report=True))
+            elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                events.append(WatchEvent('delete', path, is_dir))
+                self._unwatch_tree(path) if is_dir else None
+            elif mask & self.IN_CLOSE_WRITE:
+                events.append(WatchEvent('close_write', path, is_dir))
+            elif mask & self.IN_MODIFY:
+                events.append(WatchEvent('modify', path, is_dir))
+
+        return events
+
+    def _read_poll(self, timeout: float = None) -> list[WatchEvent]:
+        wait = self._polled_at + self.poll_interval - monotonic()
+        if timeout is not None and timeout < wait:
+            sleep(max(timeout, 0))
+            return []
+
+        sleep(max(wait, 0))
+        state, self._polled_at = self._scan(), monotonic()
+        previous, self._state = self._state, state
+
+        events = [WatchEvent('create', path, state[path][0]) for path in state.keys() - previous.keys()]
+        events.extend(WatchEvent('delete', path, previous[path][0]) for path in previous.keys() - state.keys())
+        events.extend(
+            WatchEvent('modify', path, state[path][0])
+            for path in state.keys() & previous.keys() if state[path] != previous[path] and not state[path][0]
+        )
+        return events
+
+    def _scan(self) -> dict[str, tuple]:
+        state = {}
+        for root, dirs, files in Dir.scan(self.path, skip_dir=None if self.recursive else lambda entry: True):
+            for entry in dirs:
+                state[normpath(entry.path)] = (True,)
+            for entry in files:
+                try:
+                    _stat = entry.stat()
+                except OSError:
+                    continue
+                state[normpath(entry.path)] = (False, _stat.st_size, _stat.st_mtime_ns)
+        return state
@@ -1,4 +1,12 @@
 # -*- coding: utf-8 -*-
 from .File import File
+from .DownloadResult import DownloadResult
+from .SyncResult import SyncResult
+from .DeleteResult import DeleteResult
+from .DownloadCache import DownloadCache
+from .HashCache import HashCache
+from .DirSnapshot import DirSnapshot, FileState, SnapshotDiff
+from .HttpRangeReader import HttpRangeReader
+from .Watcher import Watcher, WatchEvent
 from .Service import Service
 from . import Shell, Dir, Process, Str